@@ -395,16 +395,14 @@ def load_performace():
 
     # loader.load_from_athena_custom_query(query, 'employees_performance_scores')
     tables = ['performance_review_processes', 'performance_review_process_targets', 'performance_review_evaluations', 'performance_review_final_employee_scores', 'performance_review_employee_scores']
-    for table in tables:
-        loader.load_from_athena(table)
+    loader.load_many_from_athena(tables)
 
 def load_basics_tables():
     # tables = ['teams', 'memberships', 'employees', 'contracts_contract_versions']
     tables = ['job_catalog_roles']
     tables = ['job_catalog_levels']
     loader = Loader()
-    for table in tables:
-        loader.load_from_athena(table)
+    loader.load_many_from_athena(tables)
 
 def load_airtable_tables():
     loader = Loader()
@@ -425,8 +423,7 @@ def load_ats_factorial_tables():
     # tables = ['ats_applications']
     tables = ['ats_hiring_phases', 'ats_application_phases']
     loader = Loader()
-    for table in tables:
-        loader.load_from_athena(table)
+    loader.load_many_from_athena(tables)
 
 
 def main():
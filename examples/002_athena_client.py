@@ -18,5 +18,7 @@ if __name__ == "__main__":
     FROM employees
     LIMIT 10;
     """
-    df = query_athena(sample_query, workgroup='primary')
-    print(df)
\ No newline at end of file
+    # typed=True casts columns from their Athena types; typed=False keeps every value a string
+    df = query_athena(sample_query, workgroup='primary', typed=True)
+    print(df)
+    print(df.dtypes)
\ No newline at end of file
@@ -6,8 +6,14 @@ Reads authentication token from environment variables.
 """
 
 import os
+import random
 import re
-from typing import Optional, Dict, Any, Union
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Union
+
+from .rate_limit import AIRTABLE_REQUESTS_PER_SECOND, get_bucket
 
 try:
     from dotenv import load_dotenv
@@ -18,6 +24,7 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -31,6 +38,20 @@ except ImportError:
     print("Warning: pandas library not available. Install with: pip install pandas")
 
 
+DEFAULT_API_URL = "https://api.airtable.com/v0"
+
+# Status codes worth retrying; 429 is always safe to retry since Airtable rejected the request
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# 5xx and connection errors are only retried for methods that can be safely repeated
+IDEMPOTENT_METHODS = {'GET', 'PATCH', 'PUT', 'DELETE'}
+# Airtable blocks a base for 30 seconds after a 429
+RATE_LIMIT_PENALTY_SECONDS = 30.0
+# Maximum number of records Airtable accepts per create/update/delete request
+BATCH_SIZE = 10
+# Record metadata columns added by the DataFrame builders, next to the field columns
+METADATA_COLUMNS = ('airtable_id', 'created_time')
+
+
 class AirtableClient:
     """
     Simple Airtable API client
@@ -38,22 +59,41 @@ class AirtableClient:
     Reads the Airtable API token from environment variables.
     The token should be stored under the key 'tair_ak' in your .env file.
     
+    All requests go through one pooled requests.Session (keep-alive, no TLS handshake
+    per call), are throttled by a token bucket shared per base (5 req/s by default) and
+    retried with exponential backoff on 429/5xx, honouring the Retry-After header.
+    The API URL can be pointed at a local mock server with AIRTABLE_API_URL.
+    
     Usage:
         client = AirtableClient()
         print(f"Token loaded: {client.token is not None}")
     """
     
-    def __init__(self, env_file_path: Optional[str] = None):
+    def __init__(self, env_file_path: Optional[str] = None, api_url: Optional[str] = None,
+                 requests_per_second: float = AIRTABLE_REQUESTS_PER_SECOND, max_retries: int = 5,
+                 backoff_seconds: float = 1.0, timeout: float = 30.0, pool_maxsize: int = 10):
         """
         Initialize the Airtable client
         
         Args:
             env_file_path: Optional path to .env file. If not provided, 
                           will look for .env in current directory and parent directories
+            api_url: Airtable API root. Defaults to AIRTABLE_API_URL or https://api.airtable.com/v0
+            requests_per_second: Request rate allowed per base
+            max_retries: Retries for rate-limited, failed or timed out requests
+            backoff_seconds: Initial retry delay, doubled on every attempt
+            timeout: Seconds to wait for a response
+            pool_maxsize: Keep-alive connections kept in the session pool
         """
         self.token: Optional[str] = None
         self._load_environment(env_file_path)
         self._load_token()
+        self.api_url = (api_url or os.getenv('AIRTABLE_API_URL', DEFAULT_API_URL)).rstrip('/')
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.session = self._create_session(pool_maxsize) if REQUESTS_AVAILABLE else None
     
     def _load_environment(self, env_file_path: Optional[str] = None):
         """Load environment variables from .env file"""
@@ -129,6 +169,71 @@ class AirtableClient:
             'Content-Type': 'application/json'
         }
     
+    def _create_session(self, pool_maxsize: int) -> 'requests.Session':
+        """Create a session with a keep-alive connection pool; retries are handled in _request"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _retry_delay(self, response: Optional['requests.Response'], attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After when given, exponential backoff with jitter otherwise"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return max(float(retry_after), 0.0)
+                except ValueError:
+                    pass
+            if response.status_code == 429:
+                return RATE_LIMIT_PENALTY_SECONDS
+        return self.backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.1)
+    
+    def _request(self, method: str, base_id: str, path: str = '', **kwargs) -> 'requests.Response':
+        """
+        Make a throttled API request with retries
+        
+        Args:
+            method: HTTP method
+            base_id: Airtable base ID, used for the URL and the rate limit bucket
+            path: Path below the base (e.g. 'tbl123' or 'tbl123/rec456')
+            **kwargs: Passed to requests.Session.request (params, json, ...)
+            
+        Returns:
+            requests.Response: Successful response
+            
+        Raises:
+            requests.exceptions.RequestException: Once retries are exhausted or for non-retryable errors
+        """
+        method = method.upper()
+        url = f"{self.api_url}/{base_id}/{path}" if path else f"{self.api_url}/{base_id}"
+        bucket = get_bucket(base_id, self.requests_per_second)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, headers=self.get_headers(), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if method not in IDEMPOTENT_METHODS or attempt == self.max_retries:
+                    raise
+            else:
+                retryable = response.status_code == 429 or (
+                    response.status_code in RETRY_STATUS_CODES and method in IDEMPOTENT_METHODS
+                )
+                if not retryable or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+            
+            delay = self._retry_delay(response, attempt)
+            if response is not None and response.status_code == 429:
+                bucket.penalize(delay)
+            status = response.status_code if response is not None else 'connection error'
+            print(f"⏳ Airtable {method} {status}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+    
     def __str__(self) -> str:
         """String representation of the client"""
         status = "✅ Configured" if self.is_configured else "❌ Not configured"
@@ -202,37 +307,12 @@ class AirtableClient:
         if not REQUESTS_AVAILABLE:
             raise RuntimeError("requests library not available. Install with: pip install requests")
         
-        # Build API URL
-        api_url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-        
-        # Get headers
-        headers = self.get_headers()
-        
         # Collect all records across pages
         all_records = []
-        offset = None
         
         try:
-            while True:
-                # Add offset to params if we have one
-                params = kwargs.copy()
-                if offset:
-                    params['offset'] = offset
-                
-                # Make request
-                response = requests.get(api_url, headers=headers, params=params)
-                response.raise_for_status()  # Raise exception for bad status codes
-                
-                data = response.json()
-                records = data.get('records', [])
+            for records in self._iter_pages(base_id, table_id, **kwargs):
                 all_records.extend(records)
-                
-                # Check if there are more pages
-                offset = data.get('offset')
-                if not offset:
-                    # No more pages
-                    break
-                
                 print(f"📄 Fetched {len(all_records)} records so far...")
             
             # Return combined results
@@ -287,29 +367,57 @@ class AirtableClient:
         Raises:
             RuntimeError: If pandas is not available
         """
+        return self._pages_to_dataframe([records])
+    
+    def _pages_to_dataframe(self, pages) -> 'pd.DataFrame':
+        """
+        Build a DataFrame column by column straight from pages of Airtable records
+        
+        Values are appended to one list per field as each page arrives, so only the
+        current page and the column lists are held in memory; no per-record dict is built.
+        Fields missing from a record (Airtable omits empty fields) become None.
+        
+        Args:
+            pages: Iterable of record lists, e.g. iter_pages(...)
+            
+        Returns:
+            pandas.DataFrame: One row per record with 'airtable_id', 'created_time' and one column per field
+            
+        Raises:
+            RuntimeError: If pandas is not available
+            ValueError: If the table has a field named like a metadata column, whose values
+                would otherwise silently overwrite each other
+        """
         
         if not PANDAS_AVAILABLE:
             raise RuntimeError("pandas library not available. Install with: pip install pandas")
         
-        if not records:
+        columns = {name: [] for name in METADATA_COLUMNS}
+        row_count = 0
+        for records in pages:
+            for record in records:
+                columns['airtable_id'].append(record.get('id'))
+                columns['created_time'].append(record.get('createdTime'))
+                for field, value in record.get('fields', {}).items():
+                    if field in METADATA_COLUMNS:
+                        raise ValueError(
+                            f"Airtable field '{field}' clashes with the '{field}' metadata column; "
+                            f"rename the field or exclude it with fields=[...]"
+                        )
+                    values = columns.setdefault(field, [])
+                    # Pad for the records that did not have this field
+                    if len(values) < row_count:
+                        values.extend([None] * (row_count - len(values)))
+                    values.append(value)
+                row_count += 1
+        
+        if row_count == 0:
             return pd.DataFrame()
         
-        # Flatten each record
-        flattened_records = []
-        for record in records:
-            # Start with record metadata
-            flat_record = {
-                'airtable_id': record.get('id'),
-                'created_time': record.get('createdTime')
-            }
-            
-            # Add all fields from the 'fields' object
-            fields = record.get('fields', {})
-            flat_record.update(fields)
-            
-            flattened_records.append(flat_record)
-        
-        return pd.DataFrame(flattened_records)
+        for values in columns.values():
+            if len(values) < row_count:
+                values.extend([None] * (row_count - len(values)))
+        return pd.DataFrame(columns)
     
     def get_table_dataframe(self, base_id: str, table_id: str, **kwargs) -> 'pd.DataFrame':
         """
@@ -318,7 +426,8 @@ class AirtableClient:
         Args:
             base_id: Airtable base ID (e.g., 'app82aWzFKUVNZa3m')
             table_id: Airtable table ID (e.g., 'tbl8oOJfPgxSFmwq7')
-            **kwargs: Additional query parameters (maxRecords, pageSize, etc.)
+            **kwargs: Options of iter_pages (fields, filter_by_formula, cell_format, ...)
+                      and additional query parameters (maxRecords, pageSize, etc.)
             
         Returns:
             pandas.DataFrame: Table data as DataFrame
@@ -329,12 +438,8 @@ class AirtableClient:
             Exception: For API errors
         """
         
-        # Get raw data first
-        data = self.get_table_data(base_id, table_id, **kwargs)
-        
-        # Convert to DataFrame
-        records = data.get('records', [])
-        return self._records_to_dataframe(records)
+        # Build the columns page by page instead of collecting every record first
+        return self._pages_to_dataframe(self.iter_pages(base_id, table_id, **kwargs))
     
     def get_table_dataframe_from_url(self, url: str, **kwargs) -> 'pd.DataFrame':
         """
@@ -368,16 +473,57 @@ class AirtableClient:
         
         return self.get_table_dataframe(parsed['base_id'], parsed['table_id'], **kwargs)
 
-    def delete_all_records(self, table_url: str) -> None:
+    def _iter_pages(self, base_id: str, table_id: str, **params):
         """
-        Delete all records from an Airtable table specified by its URL.
+        Yield the records of a table one page (up to 100 records) at a time,
+        following the pagination offset
         
         Args:
-            table_url: Full Airtable table URL (e.g., https://airtable.com/app.../tbl...)   
+            base_id: Airtable base ID
+            table_id: Airtable table ID
+            **params: Query parameters (pageSize, view, fields[], ...)
+        """
+        offset = None
+        while True:
+            page_params = params.copy()
+            if offset:
+                page_params['offset'] = offset
+            data = self._request('GET', base_id, table_id, params=page_params).json()
+            yield data.get('records', [])
+            offset = data.get('offset')
+            if not offset:
+                break
+    
+    def iter_pages(self, base_id: str, table_id: str, fields: Optional[List[str]] = None,
+                   filter_by_formula: Optional[str] = None, cell_format: Optional[str] = None,
+                   time_zone: Optional[str] = None, user_locale: Optional[str] = None,
+                   page_size: int = 100, **params):
+        """
+        Yield the records of a table page by page, without holding the whole table in memory
+        
+        Args:
+            base_id: Airtable base ID (e.g., 'app82aWzFKUVNZa3m')
+            table_id: Airtable table ID (e.g., 'tbl8oOJfPgxSFmwq7')
+            fields: Only return these fields (sent as fields[])
+            filter_by_formula: Airtable formula; only records for which it is truthy are returned
+            cell_format: 'json' (default) or 'string'; 'string' requires time_zone and user_locale
+            time_zone: Time zone used to format dates when cell_format='string'
+            user_locale: Locale used to format values when cell_format='string'
+            page_size: Records per page (max 100)
+            **params: Additional query parameters (view, maxRecords, sort[0][field], ...)
+            
+        Yields:
+            list: Records of one page
+            
         Raises:
-            ValueError: If URL cannot be parsed or client is not configured
+            ValueError: If client is not configured
             RuntimeError: If requests library is not available
             Exception: For API errors
+            
+        Example:
+            for records in client.iter_pages(base_id, table_id, fields=['Name', 'Email'],
+                                             filter_by_formula="{Status} = 'Active'"):
+                process(records)
         """
         
         if not self.is_configured:
@@ -386,44 +532,139 @@ class AirtableClient:
         if not REQUESTS_AVAILABLE:
             raise RuntimeError("requests library not available. Install with: pip install requests")
         
-        # Parse the URL
-        parsed = self.parse_airtable_url(table_url)
-        
-        if not parsed['base_id'] or not parsed['table_id']:
-            raise ValueError(f"Could not parse Airtable URL: {table_url}")
+        params = {'pageSize': page_size, **params}
+        if fields:
+            params['fields[]'] = list(fields)
+        if filter_by_formula:
+            params['filterByFormula'] = filter_by_formula
+        if cell_format:
+            params['cellFormat'] = cell_format
+        if time_zone:
+            params['timeZone'] = time_zone
+        if user_locale:
+            params['userLocale'] = user_locale
         
-        base_id = parsed['base_id']
-        table_id = parsed['table_id']
+        try:
+            yield from self._iter_pages(base_id, table_id, **params)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Airtable API request failed: {str(e)}")
+    
+    def iter_records(self, base_id: str, table_id: str, **kwargs):
+        """
+        Yield the records of a table one at a time (see iter_pages for the options)
         
-        # Get all records to delete
-        records_data = self.get_table_data(base_id, table_id, pageSize=100)
+        Yields:
+            dict: Airtable record with 'id', 'createdTime' and 'fields'
+        """
+        for records in self.iter_pages(base_id, table_id, **kwargs):
+            yield from records
+    
+    def delete_all_records(self, table_url: str, max_workers: int = 4, max_passes: int = 3,
+                           record_ids: Optional[List[str]] = None,
+                           raise_on_failure: bool = True) -> Dict[str, Any]:
+        """
+        Delete all records from an Airtable table specified by its URL.
         
-        records = records_data.get('records', [])
-        record_ids = [record['id'] for record in records]
+        Record IDs are streamed page by page while the table is listed, and each batch
+        of 10 is deleted concurrently (within the per-base rate limit) without waiting for
+        the listing to finish. Since deleting while paginating can make the listing skip
+        records, the table is listed again until it is empty or max_passes is reached.
+        At most 2 * max_workers batches are queued at a time, so listing does not run
+        ahead of the deletes.
+        Failed batches do not stop the deletion, but the call raises once it is done unless
+        raise_on_failure=False, in which case the failed IDs are returned so the call can be
+        resumed with record_ids=summary['failed_ids'] (or simply run again).
         
-        if not record_ids:
-            print("No records found to delete.")
-            return
+        Args:
+            table_url: Full Airtable table URL (e.g., https://airtable.com/app.../tbl...)   
+            max_workers: DELETE batches in flight at the same time
+            max_passes: Maximum number of list-and-delete passes over the table
+            record_ids: Only delete these records (e.g. failed IDs of a previous call)
+            raise_on_failure: Raise when some records could not be deleted instead of
+                              only reporting them in the summary
+        Returns:
+            dict: 'deleted' count, 'failed_ids' that could not be deleted, and 'passes' made
+        Raises:
+            ValueError: If URL cannot be parsed or client is not configured
+            RuntimeError: If requests library is not available
+            Exception: For API errors while listing records, and for records that could
+                       not be deleted when raise_on_failure is True
+        """
         
-        print(f"Deleting {len(record_ids)} records from table {table_id} in base {base_id}...")
+        base_id, table_id = self._parse_table_url(table_url)
         
-        # Airtable API allows batch deletion of up to 10 records at a time
-        batch_size = 10
-        for i in range(0, len(record_ids), batch_size):
-            batch_ids = record_ids[i:i + batch_size]
-            
-            # Build URL with record IDs as query parameters
+        def delete_batch(batch_ids: List[str]) -> List[str]:
+            # Record IDs go as query parameters
             # Example: ?records[]=rec1&records[]=rec2
-            delete_url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-            record_params = '&'.join([f"records[]={rid}" for rid in batch_ids])
-            full_delete_url = f"{delete_url}?{record_params}"
-            
+            record_params = [('records[]', rid) for rid in batch_ids]
+            try:
+                self._request('DELETE', base_id, table_id, params=record_params)
+                return []
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Failed to delete {len(batch_ids)} records: {str(e)}")
+                return batch_ids
+        
+        def id_pages():
+            if record_ids is not None:
+                for i in range(0, len(record_ids), 100):
+                    yield record_ids[i:i + 100]
+                return
             try:
-                response = requests.delete(full_delete_url, headers=self.get_headers())
-                response.raise_for_status()
-                print(f"✅ Deleted {len(batch_ids)} records")
+                for records in self._iter_pages(base_id, table_id, pageSize=100):
+                    yield [record['id'] for record in records]
             except requests.exceptions.RequestException as e:
-                raise Exception(f"Failed to delete records: {str(e)}")
+                raise Exception(f"Failed to list records: {str(e)}")
+        
+        print(f"Deleting records from table {table_id} in base {base_id}...")
+        deleted = 0
+        failed_ids: List[str] = []
+        skipped = set()
+        passes = 0
+        max_in_flight = 2 * max_workers
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while passes < max_passes:
+                passes += 1
+                in_flight = deque()
+                submitted = 0
+                pass_deleted = 0
+                
+                def collect_oldest():
+                    batch_ids, future = in_flight.popleft()
+                    failed = future.result()
+                    failed_ids.extend(failed)
+                    skipped.update(failed)
+                    return len(batch_ids) - len(failed)
+                
+                for ids in id_pages():
+                    # Batches that already failed after retries are not retried in later passes
+                    ids = [rid for rid in ids if rid not in skipped]
+                    for i in range(0, len(ids), BATCH_SIZE):
+                        if len(in_flight) >= max_in_flight:
+                            pass_deleted += collect_oldest()
+                        batch_ids = ids[i:i + BATCH_SIZE]
+                        in_flight.append((batch_ids, executor.submit(delete_batch, batch_ids)))
+                        submitted += len(batch_ids)
+                
+                while in_flight:
+                    pass_deleted += collect_oldest()
+                deleted += pass_deleted
+                
+                if submitted:
+                    print(f"✅ Pass {passes}: deleted {pass_deleted} records")
+                # An explicit list of IDs is done in one pass; a listing is repeated until empty
+                if submitted == 0 or record_ids is not None:
+                    break
+        
+        if failed_ids:
+            if raise_on_failure:
+                raise Exception(f"{len(failed_ids)} records could not be deleted from table {table_id} "
+                                f"({deleted} deleted); run again to resume")
+            print(f"⚠️ {len(failed_ids)} records could not be deleted; resume with record_ids=summary['failed_ids']")
+        elif deleted == 0:
+            print("No records found to delete.")
+        
+        return {'deleted': deleted, 'failed_ids': failed_ids, 'passes': passes}
 
     def get_record(self, table_url: str, record_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -452,10 +693,8 @@ class AirtableClient:
         table_id = parsed['table_id']
 
         # Make API request to get the record
-        url = f"https://api.airtable.com/v0/{base_id}/{table_id}/{record_id}"
         try:
-            response = requests.get(url, headers=self.get_headers())
-            response.raise_for_status()
+            response = self._request('GET', base_id, f"{table_id}/{record_id}")
             return response.json()
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to retrieve record: {str(e)}")
@@ -501,9 +740,6 @@ class AirtableClient:
         base_id = parsed['base_id']
         table_id = parsed['table_id']
         
-        # Build API URL
-        api_url = f"https://api.airtable.com/v0/{base_id}/{table_id}"
-        
         # Prepare payload
         payload = {
             "records": [
@@ -517,8 +753,7 @@ class AirtableClient:
 
         # Make API request
         try:
-            response = requests.post(api_url, headers=self.get_headers(), json=payload)
-            response.raise_for_status()
+            response = self._request('POST', base_id, table_id, json=payload)
             result = response.json()
             records = result.get('records', [])
             if records:
@@ -559,9 +794,6 @@ class AirtableClient:
         base_id = parsed['base_id']
         table_id = parsed['table_id']
         
-        # Build API URL
-        api_url = f"https://api.airtable.com/v0/{base_id}/{table_id}/{record_id}"
-        
         # Prepare payload
         payload = {
             "fields": fields
@@ -569,13 +801,142 @@ class AirtableClient:
         
         # Make API request
         try:
-            response = requests.patch(api_url, headers=self.get_headers(), json=payload)
-            response.raise_for_status()
+            response = self._request('PATCH', base_id, f"{table_id}/{record_id}", json=payload)
             return response.json()
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to update record: {str(e)}")
 
+    def _parse_table_url(self, table_url: str) -> tuple:
+        """Return (base_id, table_id) from a table URL, checking the client can make requests"""
+        if not self.is_configured:
+            raise ValueError("Airtable client not configured. Check your .env file or environment variables.")
+        
+        if not REQUESTS_AVAILABLE:
+            raise RuntimeError("requests library not available. Install with: pip install requests")
+        
+        parsed = self.parse_airtable_url(table_url)
+        
+        if not parsed['base_id'] or not parsed['table_id']:
+            raise ValueError(f"Could not parse Airtable URL: {table_url}")
+        
+        return parsed['base_id'], parsed['table_id']
+    
+    def _write_batches(self, method: str, table_url: str, records: List[Dict[str, Any]],
+                       extra_payload: Optional[Dict[str, Any]] = None, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Send records in batches of BATCH_SIZE, several batches at a time
+        
+        Batches run concurrently in a thread pool; the per-base token bucket in _request keeps
+        the total rate within Airtable's limit. A failed batch does not stop the others.
+        
+        Returns:
+            dict: 'results' (one entry per input record, in input order, with 'record' or 'error'),
+                  'succeeded', 'failed', and for upserts 'created' / 'updated' record IDs
+        """
+        base_id, table_id = self._parse_table_url(table_url)
+        batches = [records[i:i + BATCH_SIZE] for i in range(0, len(records), BATCH_SIZE)]
+        
+        def send(batch_number: int) -> Dict[str, Any]:
+            payload = {'records': batches[batch_number], **(extra_payload or {})}
+            try:
+                return self._request(method, base_id, table_id, json=payload).json()
+            except requests.exceptions.RequestException as e:
+                detail = e.response.text if getattr(e, 'response', None) is not None else ''
+                return {'error': f"{e} {detail}".strip()}
+        
+        results = []
+        created, updated = [], []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map keeps batch order, so results line up with the input records
+            for batch_number, response in enumerate(executor.map(send, range(len(batches)))):
+                offset = batch_number * BATCH_SIZE
+                if 'error' in response:
+                    results.extend(
+                        {'index': offset + i, 'record': None, 'error': response['error']}
+                        for i in range(len(batches[batch_number]))
+                    )
+                    continue
+                for i, record in enumerate(response.get('records', [])):
+                    results.append({'index': offset + i, 'record': record, 'error': None})
+                created.extend(response.get('createdRecords', []))
+                updated.extend(response.get('updatedRecords', []))
+        
+        failed = sum(1 for result in results if result['error'])
+        summary = {'results': results, 'succeeded': len(results) - failed, 'failed': failed}
+        if extra_payload and 'performUpsert' in extra_payload:
+            summary['created'] = created
+            summary['updated'] = updated
+        print(f"✅ {method} {summary['succeeded']} records in {len(batches)} batches"
+              + (f", ❌ {failed} failed" if failed else ""))
+        return summary
+    
+    def create_records(self, table_url: str, records: List[Dict[str, Any]], typecast: bool = False,
+                       max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Create many records, 10 per request, sending batches concurrently.
+        
+        Args:
+            table_url: Full Airtable table URL (e.g., https://airtable.com/app.../tbl...)
+            records: List of field dictionaries, one per record to create
+            typecast: Let Airtable convert values (e.g. create missing select options)
+            max_workers: Batches in flight at the same time
+            
+        Returns:
+            dict: 'results' with one {'index', 'record', 'error'} entry per input record,
+                  plus 'succeeded' and 'failed' counts
+            
+        Raises:
+            ValueError: If URL cannot be parsed or client is not configured
+            RuntimeError: If requests library is not available
+        """
+        payload_records = [{'fields': fields} for fields in records]
+        return self._write_batches('POST', table_url, payload_records, {'typecast': typecast}, max_workers)
+    
+    def update_records(self, table_url: str, records: List[Dict[str, Any]], typecast: bool = False,
+                       max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Update many records, 10 per request, sending batches concurrently.
+        Only the given fields are changed (PATCH semantics).
+        
+        Args:
+            table_url: Full Airtable table URL (e.g., https://airtable.com/app.../tbl...)
+            records: List of {'id': record_id, 'fields': {...}} dictionaries
+            typecast: Let Airtable convert values
+            max_workers: Batches in flight at the same time
+            
+        Returns:
+            dict: 'results' with one {'index', 'record', 'error'} entry per input record,
+                  plus 'succeeded' and 'failed' counts
+        """
+        payload_records = [{'id': record['id'], 'fields': record['fields']} for record in records]
+        return self._write_batches('PATCH', table_url, payload_records, {'typecast': typecast}, max_workers)
+    
+    def upsert_records(self, table_url: str, records: List[Dict[str, Any]], fields_to_merge_on: List[str],
+                       typecast: bool = False, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Create or update many records, matching existing ones on fields_to_merge_on
+        (Airtable's performUpsert), 10 per request, sending batches concurrently.
+        
+        Args:
+            table_url: Full Airtable table URL (e.g., https://airtable.com/app.../tbl...)
+            records: List of field dictionaries; each must contain the merge fields
+            fields_to_merge_on: Field names identifying a record (1 to 3 fields)
+            typecast: Let Airtable convert values
+            max_workers: Batches in flight at the same time
+            
+        Returns:
+            dict: 'results' with one {'index', 'record', 'error'} entry per input record,
+                  'succeeded' and 'failed' counts, and the 'created' / 'updated' record IDs
+                  
+        Example:
+            result = client.upsert_records(table_url, rows, fields_to_merge_on=['employee_id'])
+            print(f"{len(result['created'])} created, {len(result['updated'])} updated")
+        """
+        payload_records = [{'fields': fields} for fields in records]
+        extra_payload = {'performUpsert': {'fieldsToMergeOn': fields_to_merge_on}, 'typecast': typecast}
+        return self._write_batches('PATCH', table_url, payload_records, extra_payload, max_workers)
+
 # Example usage and testing
 if __name__ == '__main__':
     print("🔧 Testing Airtable Client")
@@ -0,0 +1,85 @@
+"""
+Token-bucket rate limiting for the Airtable API
+
+Airtable allows 5 requests per second per base and answers 429 (with a 30 second
+penalty) when the limit is exceeded. One bucket is shared per base by every
+AirtableClient in the process, so concurrent callers stay under the limit together.
+"""
+
+import threading
+import time
+from typing import Dict
+
+AIRTABLE_REQUESTS_PER_SECOND = 5.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second.
+    acquire() blocks until a token is available.
+
+    Usage:
+        bucket = TokenBucket(rate=5, capacity=5)
+        bucket.acquire()  # waits if the bucket is empty
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, sleeping until they are available
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float):
+        """Empty the bucket and keep it empty for `seconds` (used after a 429)"""
+        with self._lock:
+            self._tokens = -seconds * self.rate
+            self._updated_at = time.monotonic()
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(base_id: str, rate: float = AIRTABLE_REQUESTS_PER_SECOND) -> TokenBucket:
+    """
+    Get the process-wide token bucket for an Airtable base, creating it on first use
+
+    Args:
+        base_id: Airtable base ID
+        rate: Requests per second allowed for the base
+
+    Returns:
+        TokenBucket: Bucket shared by every client talking to that base
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(base_id)
+        if bucket is None:
+            bucket = TokenBucket(rate=rate)
+            _buckets[base_id] = bucket
+        return bucket
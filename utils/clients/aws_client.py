@@ -1,57 +1,407 @@
 
 
+import asyncio
 import boto3
 import time
+from decimal import Decimal
 import pandas as pd
+from urllib.parse import urlparse
 
-def query_athena(query, database='data_lake_bronze', workgroup='primary', sleep_time=2):
+# Adaptive status polling: start fast, back off, and never wait longer than a
+# fraction of the time the query has already spent (a query that has run for
+# t seconds is likely to need about as long again)
+POLL_MIN_DELAY = 0.25
+POLL_MAX_DELAY = 15.0
+POLL_BACKOFF = 1.5
+POLL_ELAPSED_FRACTION = 0.25
+
+# Athena column types mapped to compact pandas dtypes (decimal columns hold Decimal objects)
+ATHENA_INTEGER_DTYPES = {
+	'tinyint': 'Int8',
+	'smallint': 'Int16',
+	'integer': 'Int32',
+	'int': 'Int32',
+	'bigint': 'Int64',
+}
+ATHENA_FLOAT_DTYPES = {
+	'real': 'float32',
+	'float': 'float32',
+	'double': 'float64',
+}
+
+
+def _start_query(athena, query, database, workgroup, reuse_max_age_minutes=None):
+	params = {
+		'QueryString': query,
+		'QueryExecutionContext': {'Database': database},
+		'WorkGroup': workgroup,
+	}
+	if reuse_max_age_minutes:
+		# Let Athena serve a previous execution of the same query instead of rescanning
+		params['ResultReuseConfiguration'] = {
+			'ResultReuseByAgeConfiguration': {'Enabled': True, 'MaxAgeInMinutes': reuse_max_age_minutes}
+		}
+	response = athena.start_query_execution(**params)
+	return response['QueryExecutionId']
+
+
+def _elapsed_seconds(execution, started_at):
+	"""
+	Time the query has spent so far, from the Athena Statistics when available
+	(queue + engine time) and from the wall clock otherwise.
+	"""
+	stats = execution.get('Statistics', {})
+	athena_ms = stats.get('QueryQueueTimeInMillis', 0) + stats.get('EngineExecutionTimeInMillis', 0)
+	return max(athena_ms / 1000, time.monotonic() - started_at)
+
+
+def _next_poll_delay(execution, previous_delay, started_at):
+	"""
+	Seconds to wait before the next status check of a running or queued query.
+	Grows exponentially from POLL_MIN_DELAY but stays below POLL_ELAPSED_FRACTION
+	of the elapsed query time, so short queries are noticed quickly and long ones
+	are not polled every couple of seconds.
+	"""
+	estimate = _elapsed_seconds(execution, started_at) * POLL_ELAPSED_FRACTION
+	delay = min(previous_delay * POLL_BACKOFF, max(POLL_MIN_DELAY, estimate))
+	return min(max(delay, POLL_MIN_DELAY), POLL_MAX_DELAY)
+
+
+def _wait_for_query(athena, query_execution_id, sleep_time=None):
+	"""
+	Polls Athena until the query reaches a final state.
+	Args:
+		sleep_time (int): Fixed seconds between status checks; None polls adaptively
+	Returns:
+		dict: The final QueryExecution description
+	"""
+	started_at = time.monotonic()
+	delay = POLL_MIN_DELAY / POLL_BACKOFF
+	while True:
+		result = athena.get_query_execution(QueryExecutionId=query_execution_id)
+		status = result['QueryExecution']['Status']['State']
+		if status in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+			return result['QueryExecution']
+		if sleep_time is None:
+			delay = _next_poll_delay(result['QueryExecution'], delay, started_at)
+			time.sleep(delay)
+		else:
+			time.sleep(sleep_time)
+
+
+def _get_column_info(athena, query_execution_id):
+	results = athena.get_query_results(QueryExecutionId=query_execution_id, MaxResults=1)
+	return results['ResultSet'].get('ResultSetMetadata', {}).get('ColumnInfo', [])
+
+
+def _cast_athena_column(values, athena_type):
+	"""
+	Casts a Series of raw Athena string values to the dtype matching athena_type.
+	Missing values are expected as NaN/None and are kept as nulls.
+	"""
+	athena_type = athena_type.lower().split('(')[0].strip()
+	if athena_type in ATHENA_INTEGER_DTYPES:
+		# Parsed straight to a masked integer array: going through float64 (as plain to_numeric
+		# does when the column has a NULL) would round bigints above 2**53
+		return pd.to_numeric(values, errors='coerce', dtype_backend='numpy_nullable').astype(ATHENA_INTEGER_DTYPES[athena_type])
+	if athena_type in ATHENA_FLOAT_DTYPES:
+		return pd.to_numeric(values, errors='coerce').astype(ATHENA_FLOAT_DTYPES[athena_type])
+	if athena_type == 'decimal':
+		# Exact Decimal objects: float64 would round monetary values such as salaries
+		return values.map(Decimal, na_action='ignore').astype(object).where(values.notna(), None)
+	if athena_type == 'boolean':
+		return values.map({'true': True, 'false': False}).astype('boolean')
+	if athena_type == 'date':
+		return pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+	if athena_type == 'timestamp':
+		return pd.to_datetime(values, errors='coerce')
+	return values.astype(object).where(values.notna(), None)
+
+
+def _cast_athena_frame(df, column_info):
+	"""
+	Casts the columns of df, by position, using the Athena types in column_info
+	(ResultSetMetadata.ColumnInfo). Positional so duplicated column names survive.
+	"""
+	for position, col in enumerate(column_info[:len(df.columns)]):
+		df.isetitem(position, _cast_athena_column(df.iloc[:, position], col.get('Type', 'varchar')))
+	return df
+
+
+def _decode_page(rows, column_info, typed=True):
+	"""
+	Decodes one get_query_results page into a DataFrame.
+	With typed=True NULLs become real nulls and columns are cast from their Athena types;
+	otherwise every value is kept as a string and NULLs become ''. typed='both' returns
+	a (typed, text) pair of DataFrames decoded from the same rows.
+	"""
+	columns = [col['Name'] for col in column_info]
+	if typed == 'both':
+		data = [[col.get('VarCharValue') for col in row['Data']] for row in rows]
+		df = pd.DataFrame(data, columns=columns, dtype=object)
+		return _cast_athena_frame(df.copy(), column_info), df.fillna('')
+	if typed:
+		data = [[col.get('VarCharValue') for col in row['Data']] for row in rows]
+		df = pd.DataFrame(data, columns=columns, dtype=object)
+		return _cast_athena_frame(df, column_info)
+	data = [[col.get('VarCharValue', '') for col in row['Data']] for row in rows]
+	return pd.DataFrame(data, columns=columns)
+
+
+def _fetch_results(athena, query_execution_id, typed=True):
+	"""
+	Pages through get_query_results, decoding each page as it arrives.
+	Returns:
+		pd.DataFrame: The full query result, or a (typed, text) pair when typed='both'
+	"""
+	results = athena.get_query_results(QueryExecutionId=query_execution_id)
+	column_info = results['ResultSet']['ResultSetMetadata']['ColumnInfo']
+	# The first row of the first page holds the column names
+	pages = [_decode_page(results['ResultSet']['Rows'][1:], column_info, typed)]
+	# Paginate if necessary
+	next_token = results.get('NextToken')
+	while next_token:
+		results = athena.get_query_results(QueryExecutionId=query_execution_id, NextToken=next_token)
+		pages.append(_decode_page(results['ResultSet']['Rows'], column_info, typed))
+		next_token = results.get('NextToken')
+	if typed == 'both':
+		return _concat_pages([page[0] for page in pages]), _concat_pages([page[1] for page in pages])
+	return _concat_pages(pages)
+
+
+def _concat_pages(pages):
+	if len(pages) == 1:
+		return pages[0]
+	return pd.concat(pages, ignore_index=True)
+
+
+def _parse_s3_uri(uri):
+	parsed = urlparse(uri)
+	return parsed.netloc, parsed.path.lstrip('/')
+
+
+def read_athena_output(output_location, column_info=None, chunk_size=100000, s3_client=None, typed=True):
+	"""
+	Streams the CSV file Athena wrote to output_location and yields typed DataFrame chunks.
+	Args:
+		output_location (str): s3:// URI of the query result file
+		column_info (list): ResultSetMetadata.ColumnInfo used to cast the columns
+		chunk_size (int): Rows per yielded DataFrame
+		s3_client: Optional boto3 S3 client (e.g. a moto-backed one for local testing)
+		typed (bool): Cast columns and keep NULLs as nulls; when False values stay strings and NULLs ''
+	Yields:
+		pd.DataFrame: Result chunks
+	"""
+	s3 = s3_client or boto3.client('s3')
+	bucket, key = _parse_s3_uri(output_location)
+	body = s3.get_object(Bucket=bucket, Key=key)['Body']
+	reader = pd.read_csv(
+		body,
+		chunksize=chunk_size,
+		dtype=str,
+		keep_default_na=False,
+		na_values=[''] if typed else None
+	)
+	for chunk in reader:
+		if typed and column_info:
+			chunk = _cast_athena_frame(chunk, column_info)
+		yield chunk
+
+
+def query_athena_chunks(query, database='data_lake_bronze', workgroup='primary', sleep_time=None,
+						chunk_size=100000, athena_client=None, s3_client=None, typed=True):
+	"""
+	Executes an Athena query and yields the results as typed pandas DataFrame chunks.
+	The result CSV is read straight from the query's OutputLocation instead of
+	paging through get_query_results, so memory stays bounded by chunk_size.
+	Args:
+		query (str): SQL query to execute
+		database (str): Athena database name
+		workgroup (str): Athena workgroup name
+		sleep_time (int): Fixed seconds between status checks; None (default) polls adaptively
+		chunk_size (int): Rows per yielded DataFrame
+		athena_client: Optional boto3 Athena client
+		s3_client: Optional boto3 S3 client
+		typed (bool): Cast columns from their Athena types (see read_athena_output)
+	Yields:
+		pd.DataFrame: Result chunks with columns cast from the Athena column types
+	"""
+	print(f"Executing query on Athena database '{database}' (streaming):\n{query}")
+	athena = athena_client or boto3.client('athena')
+	query_execution_id = _start_query(athena, query, database, workgroup)
+	execution = _wait_for_query(athena, query_execution_id, sleep_time)
+	status = execution['Status']['State']
+	if status != 'SUCCEEDED':
+		reason = execution['Status'].get('StateChangeReason', '')
+		raise Exception(f"Query failed with status: {status} {reason}".strip())
+
+	column_info = _get_column_info(athena, query_execution_id)
+	output_location = execution['ResultConfiguration']['OutputLocation']
+	yield from read_athena_output(output_location, column_info, chunk_size=chunk_size,
+								  s3_client=s3_client, typed=typed)
+
+
+def query_athena(query, database='data_lake_bronze', workgroup='primary', sleep_time=None, stream=False, chunk_size=100000,
+				 typed=True, cache=None, cache_version=None, reuse_max_age_minutes=None):
 	"""
 	Executes an Athena query and returns the results as a pandas DataFrame.
 	Args:
 		query (str): SQL query to execute
 		database (str): Athena database name
 		workgroup (str): Athena workgroup name
-		sleep_time (int): Seconds to wait between status checks
+		sleep_time (int): Fixed seconds between status checks; None (default) polls adaptively
+		stream (bool): Read the result CSV from S3 in chunks (see query_athena_chunks)
+			instead of paging through get_query_results
+		chunk_size (int): Rows per chunk when stream=True
+		typed (bool): Map Athena column types (bigint, double, date, timestamp, boolean...)
+			to pandas dtypes with real nulls. With typed=False every column is a string
+			and NULLs are returned as ''. typed='both' returns a (typed, text) pair decoded
+			from a single execution (not available with stream or cache)
+		cache (QueryCache): Optional local result cache (utils.query_cache) checked before
+			running the query and filled afterwards
+		cache_version (str): Version of the source data (e.g. a load date or ETag) included
+			in the cache key, so results cached for an older source are not served
+		reuse_max_age_minutes (int): Let Athena reuse a previous execution's results
+			(ResultReuseConfiguration) when they are younger than this
 	Returns:
 		pd.DataFrame: Query results as DataFrame (no column renaming)
 	"""
+	if typed == 'both' and (stream or cache is not None):
+		raise ValueError("typed='both' is not supported with stream or cache")
+	if cache is not None:
+		df = cache.get(query, database, workgroup, version=cache_version, typed=typed)
+		if df is not None:
+			return df
+		df = query_athena(query, database=database, workgroup=workgroup, sleep_time=sleep_time, stream=stream,
+						  chunk_size=chunk_size, typed=typed, reuse_max_age_minutes=reuse_max_age_minutes)
+		cache.put(query, df, database, workgroup, version=cache_version, typed=typed)
+		return df
+
+	if stream:
+		chunks = list(query_athena_chunks(query, database=database, workgroup=workgroup,
+										  sleep_time=sleep_time, chunk_size=chunk_size, typed=typed))
+		if not chunks:
+			return pd.DataFrame()
+		return pd.concat(chunks, ignore_index=True)
+
 	print(f"Executing query on Athena database '{database}':\n{query}")
 	athena = boto3.client('athena')
-	response = athena.start_query_execution(
-		QueryString=query,
-		QueryExecutionContext={'Database': database},
-		WorkGroup=workgroup
-	)
-	query_execution_id = response['QueryExecutionId']
+	query_execution_id = _start_query(athena, query, database, workgroup, reuse_max_age_minutes)
 
 	# Wait for the query to complete
-	while True:
-		result = athena.get_query_execution(QueryExecutionId=query_execution_id)
-		status = result['QueryExecution']['Status']['State']
-		if status in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
-			break
-		time.sleep(sleep_time)
+	status = _wait_for_query(athena, query_execution_id, sleep_time)['Status']['State']
 
 	if status == 'SUCCEEDED':
-		# Pagination for large result sets
-		results = athena.get_query_results(QueryExecutionId=query_execution_id)
-		columns = [col['Name'] for col in results['ResultSet']['ResultSetMetadata']['ColumnInfo']]
-		rows = results['ResultSet']['Rows'][1:]
-		data = []
-		# Process first page
-		for row in rows:
-			data.append([col.get('VarCharValue', '') for col in row['Data']])
-		# Paginate if necessary
-		next_token = results.get('NextToken')
-		while next_token:
-			results = athena.get_query_results(QueryExecutionId=query_execution_id, NextToken=next_token)
-			rows = results['ResultSet']['Rows']
-			for row in rows:
-				data.append([col.get('VarCharValue', '') for col in row['Data']])
-			next_token = results.get('NextToken')
-		df = pd.DataFrame(data, columns=columns)
-		return df
+		return _fetch_results(athena, query_execution_id, typed)
 	else:
 		print(f"Query failed with status: {status}")
 		breakpoint()
 		raise Exception(f"Query failed with status: {status}")
+
+
+def query_athena_many(queries, database='data_lake_bronze', workgroup='primary', sleep_time=None, typed=True,
+					  athena_client=None):
+	"""
+	Submits several Athena queries at once and yields each result as soon as its query finishes.
+	All running queries are polled together with batch_get_query_execution, so the total
+	wall time is that of the slowest query rather than the sum of all of them.
+	Args:
+		queries (dict): Mapping of a caller chosen key (e.g. a table name) to the SQL query
+		database (str): Athena database name
+		workgroup (str): Athena workgroup name
+		sleep_time (int): Fixed seconds between status checks; None (default) polls adaptively
+		typed (bool): Cast columns from their Athena types (see query_athena); 'both'
+			yields a (typed, text) pair per query
+		athena_client: Optional boto3 Athena client
+	Yields:
+		tuple: (key, pd.DataFrame) in completion order
+	Raises:
+		Exception: When one of the queries fails; the queries still running are stopped
+	"""
+	athena = athena_client or boto3.client('athena')
+	pending = {}
+	started_at = time.monotonic()
+	delay = POLL_MIN_DELAY / POLL_BACKOFF
+	try:
+		for key, query in queries.items():
+			print(f"Submitting query '{key}' on Athena database '{database}'")
+			pending[_start_query(athena, query, database, workgroup)] = key
+
+		while pending:
+			query_execution_ids = list(pending)
+			finished = []
+			running = []
+			# batch_get_query_execution accepts at most 50 ids per call
+			for i in range(0, len(query_execution_ids), 50):
+				response = athena.batch_get_query_execution(QueryExecutionIds=query_execution_ids[i:i + 50])
+				for execution in response['QueryExecutions']:
+					status = execution['Status']['State']
+					if status in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+						finished.append((execution['QueryExecutionId'], execution['Status']))
+					else:
+						running.append(execution)
+
+			for query_execution_id, query_status in finished:
+				key = pending.pop(query_execution_id)
+				if query_status['State'] != 'SUCCEEDED':
+					reason = query_status.get('StateChangeReason', '')
+					raise Exception(f"Query '{key}' failed with status: {query_status['State']} {reason}".strip())
+				print(f"Query '{key}' finished, {len(pending)} still running")
+				yield key, _fetch_results(athena, query_execution_id, typed)
+
+			if pending and not finished:
+				if sleep_time is None:
+					# Poll at the pace of the query most likely to finish next
+					delay = min([_next_poll_delay(execution, delay, started_at) for execution in running],
+								default=min(delay * POLL_BACKOFF, POLL_MAX_DELAY))
+					time.sleep(delay)
+				else:
+					time.sleep(sleep_time)
+	finally:
+		for query_execution_id in pending:
+			try:
+				athena.stop_query_execution(QueryExecutionId=query_execution_id)
+			except Exception as e:
+				print(f"Could not stop query {query_execution_id}: {e}")
+
+
+async def query_athena_async(query, database='data_lake_bronze', workgroup='primary', typed=True, athena_client=None):
+	"""
+	Asyncio version of query_athena with adaptive status polling.
+	Waiting between status checks is an asyncio.sleep, so many queries can be awaited
+	concurrently (e.g. with asyncio.gather) from one event loop. boto3 has no native
+	async API, so each individual Athena call runs in the default thread executor.
+	Cancelling the awaiting task stops the Athena query.
+	Args:
+		query (str): SQL query to execute
+		database (str): Athena database name
+		workgroup (str): Athena workgroup name
+		typed (bool): Cast columns from their Athena types (see query_athena)
+		athena_client: Optional boto3 Athena client
+	Returns:
+		pd.DataFrame: Query results as DataFrame
+	"""
+	print(f"Executing query on Athena database '{database}' (async):\n{query}")
+	athena = athena_client or boto3.client('athena')
+	query_execution_id = await asyncio.to_thread(_start_query, athena, query, database, workgroup)
+
+	started_at = time.monotonic()
+	delay = POLL_MIN_DELAY / POLL_BACKOFF
+	try:
+		while True:
+			result = await asyncio.to_thread(athena.get_query_execution, QueryExecutionId=query_execution_id)
+			execution = result['QueryExecution']
+			status = execution['Status']['State']
+			if status in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+				break
+			delay = _next_poll_delay(execution, delay, started_at)
+			await asyncio.sleep(delay)
+	except asyncio.CancelledError:
+		# Blocking boto3 call, kept off the event loop like the others
+		await asyncio.to_thread(athena.stop_query_execution, QueryExecutionId=query_execution_id)
+		raise
+
+	if status != 'SUCCEEDED':
+		reason = execution['Status'].get('StateChangeReason', '')
+		raise Exception(f"Query failed with status: {status} {reason}".strip())
+	return await asyncio.to_thread(_fetch_results, athena, query_execution_id, typed)
@@ -0,0 +1,152 @@
+"""
+Local Parquet mirror of Athena extracts.
+
+Extracts are stored as hive-partitioned Parquet datasets, one per table and load date:
+
+    <root>/<table>/load_date=2024-05-01/part-0.parquet
+
+Reads go through pyarrow so only the requested columns are decoded, and filters are
+pushed down to partition pruning and row-group statistics. Re-running an analysis,
+reloading Postgres or querying from DuckDB therefore never needs to go back to Athena.
+
+The root directory is PAE_DATA_LAKE_DIR, by default ~/.local/share/pae/data_lake.
+"""
+
+import os
+import re
+import shutil
+import uuid
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("Warning: pyarrow not available, Parquet data lake disabled. Install with: pip install pyarrow")
+
+
+DEFAULT_LAKE_DIR = os.path.join(os.path.expanduser('~'), '.local', 'share', 'pae', 'data_lake')
+
+_PARTITION = re.compile(r'^load_date=(\d{4}-\d{2}-\d{2})$')
+
+
+class ParquetLake:
+    """
+    Partitioned Parquet datasets on the local disk.
+
+    Usage:
+        lake = ParquetLake()
+        lake.write(df, 'athena_employees')
+        df = lake.read('athena_employees', columns=['id', 'team_id'],
+                       filters=[('company_id', '=', 1)])
+    """
+
+    def __init__(self, root=None):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the Parquet data lake. Install it with: pip install pyarrow")
+        self.root = root or os.getenv('PAE_DATA_LAKE_DIR', DEFAULT_LAKE_DIR)
+        os.makedirs(self.root, exist_ok=True)
+
+    def table_path(self, table):
+        return os.path.join(self.root, table)
+
+    def partition_path(self, table, load_date):
+        return os.path.join(self.table_path(table), f"load_date={self._date_str(load_date)}")
+
+    def tables(self):
+        """Names of the tables stored in the lake."""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name)) and not name.startswith('.')
+        )
+
+    def partitions(self, table):
+        """Load dates available for table, oldest first, as 'YYYY-MM-DD' strings."""
+        path = self.table_path(table)
+        if not os.path.isdir(path):
+            return []
+        return sorted(match.group(1) for match in map(_PARTITION.match, os.listdir(path)) if match)
+
+    def latest_partition(self, table):
+        partitions = self.partitions(table)
+        return partitions[-1] if partitions else None
+
+    def write(self, df, table, load_date=None, row_group_size=100000):
+        """
+        Writes df as the load_date partition of table (today by default), replacing any
+        previous extract for that date. The partition is written to a temporary directory
+        and renamed into place, so readers never see a partially written extract.
+        Args:
+            df (pd.DataFrame): Extract to store
+            table (str): Dataset name
+            load_date (date | str): Partition date
+            row_group_size (int): Rows per Parquet row group (granularity of predicate pushdown)
+        Returns:
+            str: Path of the partition directory
+        """
+        target = self.partition_path(table, load_date or date.today())
+        # Dot-prefixed, so dataset readers ignore it while it is being written
+        staging = os.path.join(self.table_path(table), f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_table(arrow_table, os.path.join(staging, 'part-0.parquet'), row_group_size=row_group_size)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.rename(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        print(f"🪣 Stored {len(df)} rows of '{table}' in the data lake ({os.path.basename(target)})")
+        return target
+
+    def read_arrow(self, table, columns=None, filters=None, load_date='latest'):
+        """
+        Reads table as a pyarrow.Table.
+        Args:
+            table (str): Dataset name
+            columns (list): Columns to read; None reads all of them
+            filters (list): pyarrow/DNF filters, e.g. [('company_id', '=', 1)], pushed down
+                to row groups
+            load_date (str): 'latest' (default), a specific 'YYYY-MM-DD' date, or None to read
+                every partition (a load_date column is added in that case)
+        """
+        if load_date is None:
+            path = self.table_path(table)
+        else:
+            if load_date == 'latest':
+                load_date = self.latest_partition(table)
+            if load_date is None:
+                raise FileNotFoundError(f"No partitions for table '{table}' in {self.root}")
+            path = self.partition_path(table, load_date)
+
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"'{path}' does not exist")
+        return pq.read_table(path, columns=columns, filters=filters, partitioning='hive')
+
+    def read(self, table, columns=None, filters=None, load_date='latest'):
+        """Reads table as a pandas DataFrame, see read_arrow."""
+        return self.read_arrow(table, columns=columns, filters=filters, load_date=load_date).to_pandas()
+
+    def parquet_glob(self, table, load_date='latest'):
+        """Glob of the Parquet files of a table partition, for engines that read Parquet directly."""
+        if load_date is None:
+            return os.path.join(self.table_path(table), '*', '*.parquet')
+        if load_date == 'latest':
+            load_date = self.latest_partition(table)
+        return os.path.join(self.partition_path(table, load_date), '*.parquet')
+
+    def drop_partitions(self, table, keep=1):
+        """Deletes all but the keep most recent partitions of table. Returns the dropped dates."""
+        partitions = self.partitions(table)
+        dropped = partitions[:-keep] if keep else partitions
+        for load_date in dropped:
+            shutil.rmtree(self.partition_path(table, load_date))
+        return dropped
+
+    @staticmethod
+    def _date_str(load_date):
+        return load_date.isoformat() if isinstance(load_date, date) else str(load_date)
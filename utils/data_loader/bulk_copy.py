@@ -0,0 +1,287 @@
+"""
+Bulk loading of pandas DataFrames into Postgres through COPY FROM STDIN.
+
+Much faster than DataFrame.to_sql, which sends row-wise INSERTs: the frame is
+serialized to CSV one chunk at a time (bounding memory) and streamed to the
+server in a single transaction together with the table (re)creation.
+"""
+
+import io
+import time
+
+# Marker used for NULL so that empty strings survive the CSV round trip
+COPY_NULL = '\\N'
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def qualified_table_name(table_name, schema=None):
+    if schema:
+        return f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+    return quote_identifier(table_name)
+
+
+def sql_column_types(df):
+    """
+    SQLAlchemy types for the object and nullable boolean columns of df, inferred from all
+    of their values the way DataFrame.to_sql does.
+
+    Creating a table from df.head(0) alone would make such columns TEXT, since an empty
+    object column has no values to infer from: dates, datetimes stored as objects and
+    nullable booleans would lose their type.
+    Returns:
+        dict: {column: SQLAlchemy type}, usable as to_sql(dtype=...)
+    """
+    import pandas as pd
+    from sqlalchemy import types
+
+    column_types = {}
+    for column in df.columns.unique():
+        values = df[column]
+        if isinstance(values, pd.DataFrame):
+            # Duplicated column name: let to_sql decide
+            continue
+        if isinstance(values.dtype, pd.BooleanDtype):
+            column_types[column] = types.Boolean()
+            continue
+        if not pd.api.types.is_object_dtype(values):
+            # Typed columns (numeric, datetime64, Int64...) keep their type when empty
+            continue
+        inferred = pd.api.types.infer_dtype(values, skipna=True)
+        if inferred == 'datetime':
+            column_types[column] = types.DateTime()
+        elif inferred == 'date':
+            column_types[column] = types.Date()
+        elif inferred == 'time':
+            column_types[column] = types.Time()
+        elif inferred == 'boolean':
+            column_types[column] = types.Boolean()
+        elif inferred == 'integer':
+            column_types[column] = types.BigInteger()
+        elif inferred == 'floating':
+            column_types[column] = types.Float(precision=53)
+        elif inferred == 'decimal':
+            column_types[column] = types.Numeric()
+        else:
+            column_types[column] = types.Text()
+    return column_types
+
+
+def create_table(df, table_name, conn, if_exists='replace', schema=None):
+    """
+    Creates (or replaces / keeps, following if_exists like to_sql) table_name with the
+    column types to_sql would give the full df, without inserting any rows.
+    """
+    df.head(0).to_sql(table_name, conn, if_exists=if_exists, index=False, schema=schema,
+                      dtype=sql_column_types(df))
+
+
+def copy_frame_chunks(dbapi_connection, df, table_name, schema=None, chunk_size=100000):
+    """
+    Streams df into an existing table with COPY FROM STDIN, chunk_size rows at a time.
+    Returns:
+        int: Number of rows copied
+    """
+    columns = ', '.join(quote_identifier(col) for col in df.columns)
+    copy_sql = (
+        f"COPY {qualified_table_name(table_name, schema)} ({columns}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    cursor = dbapi_connection.cursor()
+    try:
+        for start in range(0, len(df), chunk_size):
+            buffer = io.StringIO()
+            df.iloc[start:start + chunk_size].to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+    finally:
+        cursor.close()
+    return len(df)
+
+
+def copy_dataframe(df, table_name, engine, if_exists='replace', schema=None, chunk_size=100000):
+    """
+    Writes df to table_name using COPY FROM STDIN.
+
+    The table is created (or replaced / appended to, following if_exists like to_sql)
+    from the frame's dtypes and filled in the same transaction, so a failed load
+    leaves the previous table untouched. Non-Postgres engines fall back to to_sql.
+
+    Args:
+        df (pd.DataFrame): Data to load
+        table_name (str): Target table
+        engine: SQLAlchemy engine
+        if_exists (str): 'replace', 'append' or 'fail', as in DataFrame.to_sql
+        schema (str): Optional target schema
+        chunk_size (int): Rows serialized and sent per COPY call
+    Returns:
+        dict: rows, seconds and rows_per_second of the load
+    """
+    started = time.monotonic()
+
+    if engine.dialect.name != 'postgresql':
+        df.to_sql(table_name, engine, if_exists=if_exists, index=False, schema=schema, chunksize=chunk_size)
+    else:
+        with engine.begin() as conn:
+            # Create/replace the table from the frame's dtypes without inserting any rows
+            create_table(df, table_name, conn, if_exists=if_exists, schema=schema)
+            copy_frame_chunks(conn.connection, df, table_name, schema=schema, chunk_size=chunk_size)
+
+    seconds = time.monotonic() - started
+    rows_per_second = len(df) / seconds if seconds > 0 else float('inf')
+    print(f"🚚 Copied {len(df)} rows into '{table_name}' in {seconds:.2f}s ({rows_per_second:,.0f} rows/s)")
+    return {'rows': len(df), 'seconds': seconds, 'rows_per_second': rows_per_second}
+
+
+def copy_dataframe_stream(chunks, table_name, engine, if_exists='replace', schema=None, chunk_size=100000):
+    """
+    Writes an iterable of DataFrames (e.g. pd.read_csv(..., chunksize=n)) to table_name with COPY,
+    holding a single chunk in memory at a time. The table is created from the first chunk and
+    every chunk is copied in one transaction, so a failure leaves the previous table untouched.
+    Returns:
+        dict: rows, columns, seconds and rows_per_second of the load
+    """
+    started = time.monotonic()
+    rows = 0
+    columns = []
+
+    with engine.begin() as conn:
+        for position, chunk in enumerate(chunks):
+            if position == 0:
+                columns = list(chunk.columns)
+                create_table(chunk, table_name, conn, if_exists=if_exists, schema=schema)
+            if engine.dialect.name != 'postgresql':
+                chunk.to_sql(table_name, conn, if_exists='append', index=False, schema=schema, chunksize=chunk_size)
+            else:
+                copy_frame_chunks(conn.connection, chunk, table_name, schema=schema, chunk_size=chunk_size)
+            rows += len(chunk)
+
+    seconds = time.monotonic() - started
+    rows_per_second = rows / seconds if seconds > 0 else float('inf')
+    print(f"🚚 Streamed {rows} rows into '{table_name}' in {seconds:.2f}s ({rows_per_second:,.0f} rows/s)")
+    return {'rows': rows, 'columns': columns, 'seconds': seconds, 'rows_per_second': rows_per_second}
+
+
+def _table_exists(conn, table_name, schema=None):
+    from sqlalchemy import inspect
+    return inspect(conn).has_table(table_name, schema=schema)
+
+
+def swap_dataframe(df, table_name, engine, schema=None, chunk_size=100000):
+    """
+    Loads df into a staging table and swaps it in place of table_name with renames,
+    all inside one transaction: readers keep seeing the previous table until the
+    commit and never observe a missing or half-loaded one.
+    Returns:
+        dict: rows, seconds and rows_per_second of the load
+    """
+    from sqlalchemy import text
+
+    started = time.monotonic()
+    staging_table = f"{table_name}__staging"
+    old_table = f"{table_name}__old"
+
+    with engine.begin() as conn:
+        create_table(df, staging_table, conn, if_exists='replace', schema=schema)
+        copy_frame_chunks(conn.connection, df, staging_table, schema=schema, chunk_size=chunk_size)
+
+        conn.execute(text(f"DROP TABLE IF EXISTS {qualified_table_name(old_table, schema)}"))
+        if _table_exists(conn, table_name, schema=schema):
+            conn.execute(text(
+                f"ALTER TABLE {qualified_table_name(table_name, schema)} RENAME TO {quote_identifier(old_table)}"
+            ))
+        conn.execute(text(
+            f"ALTER TABLE {qualified_table_name(staging_table, schema)} RENAME TO {quote_identifier(table_name)}"
+        ))
+        conn.execute(text(f"DROP TABLE IF EXISTS {qualified_table_name(old_table, schema)}"))
+
+    seconds = time.monotonic() - started
+    rows_per_second = len(df) / seconds if seconds > 0 else float('inf')
+    print(f"🔁 Swapped in {len(df)} rows as '{table_name}' in {seconds:.2f}s ({rows_per_second:,.0f} rows/s)")
+    return {'rows': len(df), 'seconds': seconds, 'rows_per_second': rows_per_second}
+
+
+def get_high_water_mark(engine, table_name, watermark_column='_event_ts', schema=None):
+    """
+    Returns max(watermark_column) of the table, or None if the table does not exist,
+    has no such column or is empty.
+    """
+    from sqlalchemy import inspect, text
+
+    with engine.connect() as conn:
+        if not _table_exists(conn, table_name, schema=schema):
+            return None
+        columns = {col['name'] for col in inspect(conn).get_columns(table_name, schema=schema)}
+        if watermark_column not in columns:
+            return None
+        return conn.execute(text(
+            f"SELECT max({quote_identifier(watermark_column)}) FROM {qualified_table_name(table_name, schema)}"
+        )).scalar()
+
+
+def merge_dataframe(df, table_name, engine, key_column='id', watermark_column='_event_ts', schema=None,
+                    chunk_size=100000):
+    """
+    Incrementally merges df into table_name: only rows whose watermark_column is newer than the
+    table's current high-water mark are kept, deduplicated on key_column (latest version wins),
+    and upserted by deleting the matching keys and inserting the new versions in one transaction.
+    The table is created from df when it does not exist yet.
+    Returns:
+        dict: rows merged, previous high_water_mark, seconds and rows_per_second
+    """
+    import pandas as pd
+    from sqlalchemy import inspect, text
+
+    for column in (key_column, watermark_column):
+        if column not in df.columns:
+            raise ValueError(f"Incremental load of '{table_name}' needs a '{column}' column")
+
+    started = time.monotonic()
+    target = qualified_table_name(table_name, schema)
+    high_water_mark = get_high_water_mark(engine, table_name, watermark_column, schema=schema)
+
+    if high_water_mark is None:
+        if not df.empty:
+            print(f"No high-water mark for '{table_name}', doing a full load")
+        result = copy_dataframe(df, table_name, engine, if_exists='replace', schema=schema, chunk_size=chunk_size)
+        result['high_water_mark'] = None
+        return result
+
+    watermarks = pd.to_datetime(df[watermark_column], errors='coerce')
+    newer = watermarks > pd.to_datetime(high_water_mark)
+    changes = df[newer].assign(_watermark=watermarks[newer])
+    changes = changes.sort_values('_watermark').drop_duplicates(key_column, keep='last').drop(columns='_watermark')
+
+    if not changes.empty:
+        with engine.begin() as conn:
+            target_columns = {col['name'] for col in inspect(conn).get_columns(table_name, schema=schema)}
+            extra_columns = [col for col in changes.columns if col not in target_columns]
+            if extra_columns:
+                raise ValueError(f"Columns {extra_columns} do not exist in '{table_name}'; run a full load first")
+
+            staging_table = f"{table_name}__merge"
+            conn.execute(text(
+                f"CREATE TEMP TABLE {quote_identifier(staging_table)} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+            ))
+            copy_frame_chunks(conn.connection, changes, staging_table, chunk_size=chunk_size)
+
+            key = quote_identifier(key_column)
+            columns = ', '.join(quote_identifier(col) for col in changes.columns)
+            conn.execute(text(
+                f"DELETE FROM {target} t USING {quote_identifier(staging_table)} s WHERE t.{key} = s.{key}"
+            ))
+            conn.execute(text(
+                f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {quote_identifier(staging_table)}"
+            ))
+
+    seconds = time.monotonic() - started
+    rows_per_second = len(changes) / seconds if seconds > 0 else float('inf')
+    print(f"➕ Merged {len(changes)} changed rows into '{table_name}' (since {high_water_mark}) in {seconds:.2f}s")
+    return {
+        'rows': len(changes),
+        'high_water_mark': high_water_mark,
+        'seconds': seconds,
+        'rows_per_second': rows_per_second,
+    }
@@ -0,0 +1,153 @@
+"""
+Streaming readers for the CSV and Excel files loaded by Loader.load_file_to_database.
+
+CSVs are read in chunks so memory stays flat however large the file is, optionally with
+pyarrow's streaming CSV reader, using column types inferred from the whole file. Workbook
+sheets are parsed in parallel in a process pool, since openpyxl parsing is CPU bound and
+holds the GIL (threads are used instead where worker processes would re-import __main__).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def clean_column_names(df):
+    """Lowercases column names and turns spaces into underscores, in place."""
+    df.columns = [str(col).lower().replace(' ', '_') for col in df.columns]
+    return df
+
+
+def iter_csv_chunks(file_path, chunk_size=100000, engine=None):
+    """
+    Yields the CSV as DataFrames of at most chunk_size rows, with cleaned column names.
+
+    Column types are inferred from the whole file first (see infer_csv_dtypes) and every
+    chunk is read with them, so all chunks agree with the table created from the first
+    one, e.g. a column that only turns to text after the first chunk is read as text.
+
+    Args:
+        file_path (str): Path to the CSV
+        chunk_size (int): Rows per chunk (pandas engine); pyarrow yields one chunk per block
+        engine (str): None/'c' for the pandas reader, 'pyarrow' for pyarrow's streaming reader
+    """
+    dtypes = infer_csv_dtypes(file_path, chunk_size)
+    for chunk in _read_csv_chunks(file_path, chunk_size, engine, dtypes):
+        yield clean_column_names(chunk)
+
+
+def infer_csv_dtypes(file_path, chunk_size=100000):
+    """
+    Scans the whole CSV chunk by chunk (flat memory) and returns the dtype each column needs
+    to hold all of its values: widened to float when integers and decimals mix, and to text
+    as soon as any chunk holds a non-numeric value. Integer columns use the nullable Int64
+    dtype so blanks in later chunks do not turn them into floats.
+    Returns:
+        dict: {column: 'Int64' | 'float64' | 'boolean' | 'object'}, keyed by the raw column names
+    """
+    import pandas as pd
+
+    kinds = {}
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+        for position, column in enumerate(chunk.columns):
+            values = chunk.iloc[:, position]
+            if pd.api.types.is_bool_dtype(values):
+                kind = 'boolean'
+            elif pd.api.types.is_integer_dtype(values):
+                kind = 'integer'
+            elif pd.api.types.is_float_dtype(values):
+                if values.isna().all():
+                    # Blank in this chunk, says nothing about the type
+                    kinds.setdefault(column, None)
+                    continue
+                kind = 'floating'
+            else:
+                kind = 'object'
+            kinds[column] = _widest_kind(kinds.get(column), kind)
+
+    return {column: _KIND_DTYPES[kind] for column, kind in kinds.items()}
+
+
+# pandas dtype used to read each inferred kind; columns blank in the whole file stay float,
+# as pandas reads them
+_KIND_DTYPES = {None: 'float64', 'integer': 'Int64', 'floating': 'float64', 'boolean': 'boolean', 'object': 'object'}
+
+
+def _widest_kind(current, new):
+    if current is None or current == new:
+        return new
+    if {current, new} == {'integer', 'floating'}:
+        return 'floating'
+    return 'object'
+
+
+def _read_csv_chunks(file_path, chunk_size, engine, dtypes):
+    import pandas as pd
+
+    if engine == 'pyarrow':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for engine='pyarrow'. Install it with: pip install pyarrow")
+        arrow_types = {'Int64': pa.int64(), 'float64': pa.float64(), 'boolean': pa.bool_(), 'object': pa.string()}
+        convert_options = pa_csv.ConvertOptions(
+            column_types={column: arrow_types[dtype] for column, dtype in dtypes.items()}
+        )
+        pandas_types = {pa.int64(): pd.Int64Dtype(), pa.bool_(): pd.BooleanDtype()}
+        # Block size is in bytes; aim for roughly chunk_size rows of ~100 bytes each
+        read_options = pa_csv.ReadOptions(block_size=max(chunk_size * 100, 1 << 20))
+        with pa_csv.open_csv(file_path, read_options=read_options, convert_options=convert_options) as reader:
+            for batch in reader:
+                yield batch.to_pandas(types_mapper=pandas_types.get)
+        return
+
+    # Text columns are read as str so numeric-looking values keep their original spelling
+    read_dtypes = {column: (str if dtype == 'object' else dtype) for column, dtype in dtypes.items()}
+    yield from pd.read_csv(file_path, chunksize=chunk_size, dtype=read_dtypes)
+
+
+def _read_sheet(file_path, sheet_name):
+    import pandas as pd
+    return sheet_name, clean_column_names(pd.read_excel(file_path, sheet_name=sheet_name))
+
+
+def iter_excel_sheets(file_path, max_workers=None, use_processes=None):
+    """
+    Parses every sheet of a workbook in a worker pool and yields (sheet_name, DataFrame)
+    as each sheet finishes, so loading can start before the whole workbook is parsed.
+
+    Worker processes give real parallelism, but with the spawn/forkserver start methods
+    (macOS, Windows) each worker re-imports __main__, which re-runs any top-level script
+    without an `if __name__ == "__main__":` guard. Processes are therefore only used by
+    default with the fork start method; elsewhere a thread pool is used unless the caller
+    opts in with use_processes=True.
+
+    Args:
+        file_path (str): Path to the .xlsx/.xls file
+        max_workers (int): Workers, defaults to min(number of sheets, CPU count)
+        use_processes (bool): Force worker processes (True) or threads (False); None picks
+            processes only under the fork start method
+    """
+    import pandas as pd
+
+    with pd.ExcelFile(file_path) as xls:
+        sheet_names = xls.sheet_names
+
+    if len(sheet_names) <= 1 or max_workers == 1:
+        for sheet_name in sheet_names:
+            yield _read_sheet(file_path, sheet_name)
+        return
+
+    if use_processes is None:
+        use_processes = multiprocessing.get_start_method() == 'fork'
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    max_workers = max_workers or min(len(sheet_names), os.cpu_count() or 1)
+    with executor_class(max_workers=max_workers) as executor:
+        futures = [executor.submit(_read_sheet, file_path, sheet_name) for sheet_name in sheet_names]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,167 @@
+"""
+Manifest of the files loaded by Loader.load_file_to_database.
+
+Each file (and each sheet of a workbook) gets a row in the _load_manifest table
+with its content hash, mtime, size, row count, columns and target table. The
+next load compares the file against it: unchanged files are skipped and changed
+ones are reloaded and reported with a diff summary. The rows of a file are only written
+once the whole file has loaded, so a failed load never looks up to date.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, MetaData, String, Table, Text, select
+
+MANIFEST_TABLE = '_load_manifest'
+
+_metadata = MetaData()
+_manifest = Table(
+    MANIFEST_TABLE, _metadata,
+    Column('source_path', String, primary_key=True),
+    # '' for CSVs, the sheet name for workbooks
+    Column('sheet_name', String, primary_key=True),
+    Column('target_table', String, nullable=False),
+    Column('content_hash', String(64), nullable=False),
+    Column('mtime', Float, nullable=False),
+    Column('size_bytes', BigInteger, nullable=False),
+    Column('row_count', Integer, nullable=False),
+    Column('columns', Text, nullable=False),
+    Column('loaded_at', DateTime(timezone=True), nullable=False),
+)
+
+
+def file_fingerprint(file_path, previous=None, block_size=1 << 20):
+    """
+    Returns {'content_hash', 'mtime', 'size_bytes'} for file_path.
+
+    If previous (a manifest entry) has the same mtime and size, its hash is reused
+    and the file is not read; otherwise the content is hashed with SHA-256.
+    """
+    stat = os.stat(file_path)
+    fingerprint = {'mtime': stat.st_mtime, 'size_bytes': stat.st_size}
+    if previous and previous['mtime'] == stat.st_mtime and previous['size_bytes'] == stat.st_size:
+        fingerprint['content_hash'] = previous['content_hash']
+        return fingerprint
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    fingerprint['content_hash'] = digest.hexdigest()
+    return fingerprint
+
+
+class LoadManifest:
+    """
+    Reads and writes _load_manifest entries.
+
+    Usage:
+        manifest = LoadManifest(engine)
+        entries = manifest.entries(path)
+        fingerprint = file_fingerprint(path, manifest.reference_entry(entries))
+        if not manifest.file_has_changed(fingerprint, entries):
+            ...skip...
+        ...load...
+        manifest.record(path, fingerprint, [{'sheet_name': '', 'target_table': table,
+                                             'row_count': rows, 'columns': columns}])
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        _metadata.create_all(engine, tables=[_manifest], checkfirst=True)
+
+    def entries(self, source_path):
+        """Returns all manifest rows (one per sheet) for source_path, keyed by sheet name."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(_manifest)
+                .where(_manifest.c.source_path == self._key(source_path))
+                .order_by(_manifest.c.sheet_name)
+            ).mappings().all()
+        return {row['sheet_name']: dict(row) for row in rows}
+
+    def get(self, source_path, sheet_name=''):
+        return self.entries(source_path).get(sheet_name)
+
+    @staticmethod
+    def reference_entry(entries):
+        """
+        The entry whose mtime/size/hash file_fingerprint may reuse: only when every sheet row
+        of the file agrees on them, otherwise None (the file is hashed again).
+        """
+        fingerprints = {(e['content_hash'], e['mtime'], e['size_bytes']) for e in entries.values()}
+        if len(fingerprints) != 1:
+            return None
+        return next(iter(entries.values()))
+
+    @staticmethod
+    def has_changed(fingerprint, previous):
+        return previous is None or previous['content_hash'] != fingerprint['content_hash']
+
+    @classmethod
+    def file_has_changed(cls, fingerprint, entries):
+        """True unless the file has entries and every one of them matches fingerprint's hash."""
+        return not entries or any(cls.has_changed(fingerprint, entry) for entry in entries.values())
+
+    def touch(self, source_path, fingerprint):
+        """Records a new mtime for a file whose content did not change, so it is not hashed again."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                _manifest.update()
+                .where(_manifest.c.source_path == self._key(source_path))
+                .values(mtime=fingerprint['mtime'], size_bytes=fingerprint['size_bytes'])
+            )
+
+    def record(self, source_path, fingerprint, loads):
+        """
+        Stores the entries of a file that just finished loading, replacing all of its
+        previous rows (sheets that are gone are dropped) in one transaction.
+        Args:
+            source_path (str): Loaded file
+            fingerprint (dict): file_fingerprint of the file
+            loads (list): One dict per loaded table with sheet_name ('' for CSVs),
+                target_table, row_count and columns
+        """
+        key = self._key(source_path)
+        loaded_at = datetime.now(timezone.utc)
+        with self.engine.begin() as conn:
+            conn.execute(_manifest.delete().where(_manifest.c.source_path == key))
+            if loads:
+                conn.execute(_manifest.insert(), [
+                    {
+                        'source_path': key,
+                        'sheet_name': load['sheet_name'],
+                        'target_table': load['target_table'],
+                        'content_hash': fingerprint['content_hash'],
+                        'mtime': fingerprint['mtime'],
+                        'size_bytes': fingerprint['size_bytes'],
+                        'row_count': load['row_count'],
+                        'columns': json.dumps([str(col) for col in load['columns']]),
+                        'loaded_at': loaded_at,
+                    }
+                    for load in loads
+                ])
+
+    @staticmethod
+    def diff_summary(previous, row_count, columns):
+        """One-line description of how a reload differs from the previous load."""
+        if previous is None:
+            return f"new: {row_count} rows, {len(columns)} columns"
+
+        previous_columns = json.loads(previous['columns'])
+        columns = [str(col) for col in columns]
+        parts = [f"rows {previous['row_count']} -> {row_count} ({row_count - previous['row_count']:+d})"]
+        added = [col for col in columns if col not in previous_columns]
+        removed = [col for col in previous_columns if col not in columns]
+        if added:
+            parts.append(f"added columns {added}")
+        if removed:
+            parts.append(f"removed columns {removed}")
+        return ', '.join(parts)
+
+    @staticmethod
+    def _key(source_path):
+        return os.path.abspath(source_path)
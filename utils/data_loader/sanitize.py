@@ -0,0 +1,99 @@
+"""
+Column-wise sanitization of text before it is loaded into Postgres.
+
+Postgres rejects NUL bytes and strings that are not valid UTF-8 (lone surrogates
+left behind by a lossy decode), and very large values bloat the table and its
+TOAST storage. Each text column is cleaned with vectorized pandas string
+operations, touching only the rows that actually need it, instead of a Python
+call per cell.
+"""
+
+import pandas as pd
+
+# Longest text value kept as is; longer values are truncated
+MAX_TEXT_LENGTH = 1_000_000
+
+# Lone UTF-16 surrogates cannot be encoded as UTF-8
+_SURROGATES = '[\ud800-\udfff]'
+
+
+def _clean_column(values, max_length):
+    """
+    Cleans one object column. Non-string cells are left untouched.
+    Returns:
+        tuple: (cleaned Series, dict with nul/invalid_utf8/oversized counts)
+    """
+    counts = {'nul': 0, 'invalid_utf8': 0, 'oversized': 0}
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == 'string':
+        # Only strings and nulls: no per-cell type check needed
+        is_text = values.notna()
+    elif kind in ('mixed', 'mixed-integer'):
+        # .str methods return NaN for cells lacking the method; bytes and lists have
+        # len() but no isdecimal(), so only str cells come back non-null
+        is_text = values.str.isdecimal().notna()
+    else:
+        return values, counts
+    if not is_text.any():
+        return values, counts
+
+    text = values[is_text]
+
+    has_nul = text.str.contains('\x00', regex=False)
+    if has_nul.any():
+        counts['nul'] = int(has_nul.sum())
+        text = text.mask(has_nul, text[has_nul].str.replace('\x00', '', regex=False))
+
+    has_surrogates = text.str.contains(_SURROGATES, regex=True)
+    if has_surrogates.any():
+        counts['invalid_utf8'] = int(has_surrogates.sum())
+        text = text.mask(has_surrogates, text[has_surrogates].str.replace(_SURROGATES, '�', regex=True))
+
+    if max_length is not None:
+        oversized = text.str.len() > max_length
+        if oversized.any():
+            counts['oversized'] = int(oversized.sum())
+            text = text.mask(oversized, text[oversized].str.slice(0, max_length))
+
+    if not any(counts.values()):
+        return values, counts
+
+    cleaned = values.copy()
+    cleaned[is_text] = text
+    return cleaned, counts
+
+
+def sanitize_frame(df, max_length=MAX_TEXT_LENGTH, verbose=True):
+    """
+    Removes NUL bytes, replaces invalid UTF-8 with U+FFFD and truncates values longer
+    than max_length in every text column of df.
+
+    Args:
+        df (pd.DataFrame): Frame to clean; it is not modified
+        max_length (int): Maximum number of characters per value, None to disable truncation
+        verbose (bool): Print a line per column that needed cleaning
+    Returns:
+        pd.DataFrame: The cleaned frame (df itself when nothing needed cleaning)
+    """
+    report = {}
+    cleaned = df
+    for position in range(df.shape[1]):
+        values = df.iloc[:, position]
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            continue
+
+        values_clean, counts = _clean_column(values, max_length)
+        if not any(counts.values()):
+            continue
+
+        if cleaned is df:
+            cleaned = df.copy()
+        # positional so duplicate column names survive
+        cleaned.isetitem(position, values_clean)
+        report[df.columns[position]] = counts
+
+    if verbose:
+        for column, counts in report.items():
+            details = ', '.join(f"{count} {kind}" for kind, count in counts.items() if count)
+            print(f"🧹 Sanitized column '{column}': {details}")
+    return cleaned
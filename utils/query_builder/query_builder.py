@@ -1,13 +1,27 @@
+import pandas as pd
 
 
 class QueryBuilder:
     def __init__(self):
         pass
 
-    def build_simple_extraction_query(self, table_name, company_id):
+    def build_simple_extraction_query(self, table_name, company_id, since=None, watermark_column='_event_ts'):
+        """
+        Builds a SELECT * extraction for one company. With since, only rows whose
+        watermark_column is newer than that timestamp are selected (incremental loads).
+        Raises:
+            ValueError: If since cannot be parsed as a timestamp
+        """
         query = f"""
         SELECT *
         FROM {table_name}
         WHERE company_id = {company_id}
         """
+        if since is not None:
+            # Parsed rather than interpolated as is: since comes from a text column
+            since = pd.Timestamp(since)
+            if since.tzinfo is not None:
+                since = since.tz_convert('UTC').tz_localize(None)
+            query += f"""AND {watermark_column} > TIMESTAMP '{since.isoformat(sep=' ')}'
+        """
         return query
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Local Parquet cache of query results for query_athena and QueryRunner.run_query.
+
+Entries are keyed on the normalized SQL, the database/workgroup, the options that
+shape the result and an optional caller-supplied source version, so a changed
+source is a miss rather than a stale hit. Entries also expire after a TTL and are
+evicted least recently used first beyond a size limit.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (needed by DataFrame.to_parquet / read_parquet)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    print("Warning: pyarrow not available, query cache disabled. Install with: pip install pyarrow")
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pae', 'query_cache')
+
+# Quoted string literals and quoted identifiers are kept verbatim when normalizing SQL
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_LINE_COMMENT = re.compile(r'--[^\n]*')
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_TABLE_REFERENCE = re.compile(r'\b(?:from|join)\s+([a-z_][a-z0-9_.]*)')
+
+
+def normalize_sql(query):
+    """
+    Normalizes a SQL query so that formatting-only differences map to the same cache key:
+    comments are dropped, whitespace is collapsed, keywords/identifiers are lower-cased
+    and a trailing ';' is removed. Quoted literals and identifiers are left untouched.
+    """
+    parts = _QUOTED.split(query)
+    for i in range(0, len(parts), 2):
+        text = _BLOCK_COMMENT.sub(' ', parts[i])
+        text = _LINE_COMMENT.sub(' ', text)
+        parts[i] = re.sub(r'\s+', ' ', text).lower()
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def referenced_tables(query):
+    """Returns the table names that appear after FROM/JOIN in a query (best effort)."""
+    return sorted(set(_TABLE_REFERENCE.findall(normalize_sql(query))))
+
+
+class QueryCache:
+    """
+    Local, on-disk cache of query results.
+
+    Results are stored as Parquet files keyed on the normalized SQL plus the
+    database/workgroup (and any extra options that change the result, e.g. typed).
+    A version (any string describing the state of the source: an ETag, a load date,
+    the max updated_at of the table...) can be passed to every method; a different
+    version is a different key, so results of an older source are not served.
+    Entries expire after ttl_seconds and the least recently used ones are evicted
+    once the cache grows beyond max_bytes.
+
+    Usage:
+        cache = QueryCache(ttl_seconds=3600)
+        df = query_athena(query, cache=cache, cache_version=load_date)
+        cache.invalidate(table='employees')
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir=None, ttl_seconds=6 * 3600, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir or os.getenv('PAE_QUERY_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = PARQUET_AVAILABLE
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, query, database=None, workgroup=None, version=None, **options):
+        payload = json.dumps({
+            'query': normalize_sql(query),
+            'database': database,
+            'workgroup': workgroup,
+            'version': version,
+            'options': options,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, query, database=None, workgroup=None, version=None, **options):
+        """
+        Returns the cached DataFrame for the query, or None on a miss or expired entry.
+        """
+        if not self.enabled:
+            return None
+        key = self.make_key(query, database, workgroup, version, **options)
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            if self.ttl_seconds is not None and time.time() - entry['created_at'] > self.ttl_seconds:
+                self._remove_entry(index, key)
+                self._write_index(index)
+                return None
+            path = os.path.join(self.cache_dir, entry['file'])
+            try:
+                df = pd.read_parquet(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Dropping unreadable cache entry {entry['file']}: {e}")
+                self._remove_entry(index, key)
+                self._write_index(index)
+                return None
+            entry['last_access'] = time.time()
+            self._write_index(index)
+        print(f"📦 Query cache hit ({len(df)} rows, cached {int(time.time() - entry['created_at'])}s ago)")
+        return df
+
+    def put(self, query, df, database=None, workgroup=None, version=None, **options):
+        """Stores a query result, evicting least recently used entries beyond max_bytes."""
+        if not self.enabled:
+            return
+        key = self.make_key(query, database, workgroup, version, **options)
+        file_name = f"{key}.parquet"
+        path = os.path.join(self.cache_dir, file_name)
+        try:
+            df.to_parquet(path, index=False)
+        except Exception as e:
+            # Mixed-type object columns cannot always be written as Parquet; just don't cache them
+            print(f"⚠️ Could not cache query result: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            index = self._read_index()
+            index[key] = {
+                'file': file_name,
+                'size': os.path.getsize(path),
+                'created_at': now,
+                'last_access': now,
+                'database': database,
+                'workgroup': workgroup,
+                'version': version,
+                'tables': referenced_tables(query),
+            }
+            self._evict(index)
+            self._write_index(index)
+
+    def invalidate(self, query=None, table=None, database=None, workgroup=None, version=None, **options):
+        """
+        Removes cache entries. With a query, only that query's entry is removed; with a table,
+        every entry whose query reads that table (matched on the name with or without schema);
+        with neither, the whole cache is cleared.
+        Returns:
+            int: Number of removed entries
+        """
+        with self._lock:
+            index = self._read_index()
+            if query is not None:
+                keys = [self.make_key(query, database, workgroup, version, **options)]
+            elif table is not None:
+                table = table.lower()
+                keys = [
+                    key for key, entry in index.items()
+                    if any(t == table or t.split('.')[-1] == table for t in entry.get('tables', []))
+                ]
+            else:
+                keys = list(index)
+            removed = 0
+            for key in keys:
+                if key in index:
+                    self._remove_entry(index, key)
+                    removed += 1
+            self._write_index(index)
+        return removed
+
+    def clear(self):
+        return self.invalidate()
+
+    def _evict(self, index):
+        total = sum(entry['size'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]['size']
+            self._remove_entry(index, key)
+
+    def _remove_entry(self, index, key):
+        entry = index.pop(key)
+        try:
+            os.remove(os.path.join(self.cache_dir, entry['file']))
+        except FileNotFoundError:
+            pass
+
+    def _read_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
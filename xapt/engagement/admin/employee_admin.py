@@ -1,10 +1,11 @@
 from django.contrib import admin
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from datetime import date
 from .base_model_admin_mixin import BaseModelAdminMixin, combine_fieldsets, extend_list_display
 from ..models import Employee, TeamMembership
+from ..models.effective_period import active_on_q, historical_on_q
 
 
 class TeamMembershipInline(admin.TabularInline):
@@ -131,6 +132,23 @@ class EmployeeAdmin(BaseModelAdminMixin):
     # Extend base actions with Employee-specific actions
     actions = BaseModelAdminMixin.actions + ['activate_employees', 'deactivate_employees', 'export_employee_data', 'show_team_summary']
     
+    def get_queryset(self, request):
+        """Prefetch current memberships for the list view (one query per page, not per row)"""
+        return super().get_queryset(request).prefetch_related(
+            Prefetch(
+                'team_memberships',
+                queryset=TeamMembership.objects.active_on().select_related('team'),
+                to_attr='current_memberships'
+            )
+        )
+    
+    def _current_memberships(self, obj):
+        """Active memberships, prefetched by get_queryset when available"""
+        memberships = getattr(obj, 'current_memberships', None)
+        if memberships is None:
+            memberships = list(obj.team_memberships.active_on().select_related('team'))
+        return memberships
+    
     # Custom display methods
     def full_name_link(self, obj):
         """Display full name as a link to detail view"""
@@ -199,7 +217,7 @@ class EmployeeAdmin(BaseModelAdminMixin):
     
     def current_teams_short(self, obj):
         """Display current teams in a compact format for list view"""
-        active_memberships = [m for m in obj.team_memberships.all() if m.is_active]
+        active_memberships = self._current_memberships(obj)
         
         if not active_memberships:
             return '-'
@@ -235,26 +253,26 @@ class EmployeeAdmin(BaseModelAdminMixin):
     # Team Membership Display Methods
     def team_membership_summary(self, obj):
         """Display team membership summary statistics"""
-        today = date.today()
-        all_memberships = obj.team_memberships.all()
-        active_memberships = [m for m in all_memberships if m.is_active]
-        historical_memberships = [m for m in all_memberships if not m.is_active]
-        leadership_roles = [m for m in all_memberships if m.is_lead]
+        counts = obj.team_memberships.aggregate(
+            active=Count('pk', filter=active_on_q()),
+            historical=Count('pk', filter=historical_on_q()),
+            leadership=Count('pk', filter=Q(is_lead=True)),
+            total=Count('pk'),
+        )
         
         summary = []
         summary.append(f"<strong>📊 Membership Summary:</strong>")
-        summary.append(f"• <span style='color: #28a745;'>Active Teams: {len(active_memberships)}</span>")
-        summary.append(f"• Historical Teams: {len(historical_memberships)}")
-        summary.append(f"• Leadership Roles: {len(leadership_roles)}")
-        summary.append(f"• Total Memberships: {len(all_memberships)}")
+        summary.append(f"• <span style='color: #28a745;'>Active Teams: {counts['active']}</span>")
+        summary.append(f"• Historical Teams: {counts['historical']}")
+        summary.append(f"• Leadership Roles: {counts['leadership']}")
+        summary.append(f"• Total Memberships: {counts['total']}")
         
         return mark_safe("<br>".join(summary))
     team_membership_summary.short_description = 'Team Summary'
     
     def current_teams_display(self, obj):
         """Display current active team memberships"""
-        today = date.today()
-        active_memberships = [m for m in obj.team_memberships.all() if m.is_active]
+        active_memberships = self._current_memberships(obj)
         
         if not active_memberships:
             return mark_safe("<em>No active team memberships</em>")
@@ -278,14 +296,14 @@ class EmployeeAdmin(BaseModelAdminMixin):
     
     def team_history_display(self, obj):
         """Display historical team memberships"""
-        today = date.today()
-        historical_memberships = [m for m in obj.team_memberships.all() if not m.is_active]
+        historical_memberships = obj.team_memberships.historical().select_related('team').order_by('-effective_from')
+        historical_count = historical_memberships.count()
         
-        if not historical_memberships:
+        if not historical_count:
             return mark_safe("<em>No historical team memberships</em>")
         
         # Limit to most recent 10 to avoid overwhelming display
-        recent_historical = sorted(historical_memberships, key=lambda m: m.effective_from, reverse=True)[:10]
+        recent_historical = historical_memberships[:10]
         
         history_info = []
         for membership in recent_historical:
@@ -305,8 +323,8 @@ class EmployeeAdmin(BaseModelAdminMixin):
             history_info.append(f"📋 {team_link}{lead_badge}{duration_info}")
         
         # Add note if there are more historical memberships
-        if len(historical_memberships) > 10:
-            history_info.append(f"<em>... and {len(historical_memberships) - 10} more historical memberships</em>")
+        if historical_count > 10:
+            history_info.append(f"<em>... and {historical_count - 10} more historical memberships</em>")
         
         return mark_safe("<br>".join(history_info))
     team_history_display.short_description = 'Team History'
@@ -315,18 +333,19 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def manager_relationship_summary(self, obj):
         """Display manager relationship summary statistics"""
         from ..models import Manager
-        today = date.today()
         
-        # Get all manager relationships where this employee is the managed employee
-        all_relationships = Manager.objects.filter(employee=obj).order_by('-effective_from')
-        active_relationships = [r for r in all_relationships if r.is_active_relationship]
-        historical_relationships = [r for r in all_relationships if not r.is_active_relationship]
+        # Count the manager relationships where this employee is the managed employee
+        counts = Manager.objects.filter(employee=obj).aggregate(
+            active=Count('pk', filter=active_on_q()),
+            historical=Count('pk', filter=historical_on_q()),
+            total=Count('pk'),
+        )
         
         summary = []
         summary.append(f"<strong>📊 Manager Relationship Summary:</strong>")
-        summary.append(f"• <span style='color: #28a745;'>Current Manager: {len(active_relationships)}</span>")
-        summary.append(f"• Historical Managers: {len(historical_relationships)}")
-        summary.append(f"• Total Manager Changes: {len(all_relationships)}")
+        summary.append(f"• <span style='color: #28a745;'>Current Manager: {counts['active']}</span>")
+        summary.append(f"• Historical Managers: {counts['historical']}")
+        summary.append(f"• Total Manager Changes: {counts['total']}")
         
         return mark_safe("<br>".join(summary))
     manager_relationship_summary.short_description = 'Manager Summary'
@@ -334,9 +353,8 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def current_manager_display(self, obj):
         """Display current active manager"""
         from ..models import Manager
-        today = date.today()
         
-        active_relationships = [r for r in Manager.objects.filter(employee=obj) if r.is_active_relationship]
+        active_relationships = list(Manager.objects.filter(employee=obj).active_on().select_related('manager'))
         
         if not active_relationships:
             return mark_safe("<em>No current manager assigned</em>")
@@ -358,15 +376,17 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def manager_history_display(self, obj):
         """Display historical manager relationships"""
         from ..models import Manager
-        today = date.today()
         
-        historical_relationships = [r for r in Manager.objects.filter(employee=obj) if not r.is_active_relationship]
+        historical_relationships = (
+            Manager.objects.filter(employee=obj).historical().select_related('manager').order_by('-effective_from')
+        )
+        historical_count = historical_relationships.count()
         
-        if not historical_relationships:
+        if not historical_count:
             return mark_safe("<em>No manager history</em>")
         
-        # Sort by most recent first
-        recent_historical = sorted(historical_relationships, key=lambda r: r.effective_from, reverse=True)[:10]
+        # Most recent first
+        recent_historical = historical_relationships[:10]
         
         history_info = []
         for relationship in recent_historical:
@@ -381,8 +401,8 @@ class EmployeeAdmin(BaseModelAdminMixin):
             history_info.append(f"📋 {manager_link}{duration_info}")
         
         # Add note if there are more historical relationships
-        if len(historical_relationships) > 10:
-            history_info.append(f"<em>... and {len(historical_relationships) - 10} more historical managers</em>")
+        if historical_count > 10:
+            history_info.append(f"<em>... and {historical_count - 10} more historical managers</em>")
         
         return mark_safe("<br>".join(history_info))
     manager_history_display.short_description = 'Manager History'
@@ -391,22 +411,23 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def contract_summary(self, obj):
         """Display contract summary statistics"""
         from ..models import Contract
-        today = date.today()
         
-        all_contracts = Contract.objects.filter(employee=obj).order_by('-effective_from')
-        active_contracts = [c for c in all_contracts if c.is_active_contract]
-        historical_contracts = [c for c in all_contracts if not c.is_active_contract]
-        
-        # Calculate total compensation from active contracts
-        total_compensation = sum(c.salary_amount for c in active_contracts if c.salary_amount)
+        counts = Contract.objects.filter(employee=obj).aggregate(
+            active=Count('pk', filter=active_on_q()),
+            historical=Count('pk', filter=historical_on_q()),
+            total=Count('pk'),
+            # Total compensation from active contracts
+            total_compensation=Sum('salary_amount', filter=active_on_q()),
+        )
+        total_compensation = counts['total_compensation']
         
         summary = []
         summary.append(f"<strong>📊 Contract Summary:</strong>")
-        summary.append(f"• <span style='color: #28a745;'>Active Contracts: {len(active_contracts)}</span>")
+        summary.append(f"• <span style='color: #28a745;'>Active Contracts: {counts['active']}</span>")
         if total_compensation:
             summary.append(f"• Total Active Compensation: <strong>${total_compensation:,.2f}</strong>")
-        summary.append(f"• Historical Contracts: {len(historical_contracts)}")
-        summary.append(f"• Total Contracts: {len(all_contracts)}")
+        summary.append(f"• Historical Contracts: {counts['historical']}")
+        summary.append(f"• Total Contracts: {counts['total']}")
         
         return mark_safe("<br>".join(summary))
     contract_summary.short_description = 'Contract Summary'
@@ -414,16 +435,15 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def current_contracts_display(self, obj):
         """Display current active contracts"""
         from ..models import Contract
-        today = date.today()
         
-        active_contracts = [c for c in Contract.objects.filter(employee=obj) if c.is_active_contract]
+        # Most recent first
+        active_contracts = list(
+            Contract.objects.filter(employee=obj).active_on().select_related('role').order_by('-effective_from')
+        )
         
         if not active_contracts:
             return mark_safe("<em>No active contracts</em>")
         
-        # Sort by most recent first
-        active_contracts.sort(key=lambda c: c.effective_from, reverse=True)
-        
         contracts_info = []
         for contract in active_contracts:
             # Create role link
@@ -450,15 +470,17 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def contract_history_display(self, obj):
         """Display historical contracts"""
         from ..models import Contract
-        today = date.today()
         
-        historical_contracts = [c for c in Contract.objects.filter(employee=obj) if not c.is_active_contract]
+        historical_contracts = (
+            Contract.objects.filter(employee=obj).historical().select_related('role').order_by('-effective_from')
+        )
+        historical_count = historical_contracts.count()
         
-        if not historical_contracts:
+        if not historical_count:
             return mark_safe("<em>No contract history</em>")
         
-        # Sort by most recent first, limit to 10
-        recent_historical = sorted(historical_contracts, key=lambda c: c.effective_from, reverse=True)[:10]
+        # Most recent first, limit to 10
+        recent_historical = historical_contracts[:10]
         
         history_info = []
         for contract in recent_historical:
@@ -483,8 +505,8 @@ class EmployeeAdmin(BaseModelAdminMixin):
             )
         
         # Add note if there are more historical contracts
-        if len(historical_contracts) > 10:
-            history_info.append(f"<em>... and {len(historical_contracts) - 10} more historical contracts</em>")
+        if historical_count > 10:
+            history_info.append(f"<em>... and {historical_count - 10} more historical contracts</em>")
         
         return mark_safe("<br>".join(history_info))
     contract_history_display.short_description = 'Contract History'
@@ -624,19 +646,11 @@ class EmployeeAdmin(BaseModelAdminMixin):
     def show_team_summary(self, request, queryset):
         """Show team membership summary for selected employees"""
         total_employees = queryset.count()
-        total_active_memberships = 0
-        total_leadership_roles = 0
-        teams_covered = set()
+        active_memberships = TeamMembership.objects.filter(employee__in=queryset).active_on()
         
-        for employee in queryset:
-            active_memberships = [m for m in employee.team_memberships.all() if m.is_active]
-            leadership_roles = [m for m in employee.team_memberships.all() if m.is_lead and m.is_active]
-            
-            total_active_memberships += len(active_memberships)
-            total_leadership_roles += len(leadership_roles)
-            
-            for membership in active_memberships:
-                teams_covered.add(membership.team.team_name)
+        total_active_memberships = active_memberships.count()
+        total_leadership_roles = active_memberships.filter(is_lead=True).count()
+        teams_covered = set(active_memberships.values_list('team__team_name', flat=True))
         
         self.message_user(
             request,
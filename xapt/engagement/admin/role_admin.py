@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from .base_model_admin_mixin import BaseModelAdminMixin, combine_fieldsets, extend_list_display
 from ..models import Role
+from ..models.effective_period import active_on_q
 
 
 @admin.register(Role)
@@ -63,20 +65,27 @@ class RoleAdmin(BaseModelAdminMixin):
     ordering = ('role_name', 'level_name')
     list_per_page = 25
     
+    def get_queryset(self, request):
+        """Count contracts in the list query instead of once per row"""
+        return super().get_queryset(request).annotate(
+            _contract_count=Count('contracts'),
+            _active_contracts_count=Count('contracts', filter=active_on_q(prefix='contracts__')),
+        )
+    
     # Custom display methods
     def contract_count(self, obj):
         """Display total number of contracts for this role"""
-        count = obj.contracts.count()
+        count = obj._contract_count
         return format_html(
             '<span style="font-weight: bold;">{}</span>',
             count
         )
     contract_count.short_description = 'Total Contracts'
+    contract_count.admin_order_field = '_contract_count'
     
     def active_contracts_count(self, obj):
         """Display number of active contracts"""
-        active_contracts = [c for c in obj.contracts.all() if c.is_active_contract]
-        count = len(active_contracts)
+        count = obj._active_contracts_count
         if count > 0:
             return format_html(
                 '<span style="background-color: #28a745; color: white; padding: 2px 8px; '
@@ -85,21 +94,21 @@ class RoleAdmin(BaseModelAdminMixin):
             )
         return count
     active_contracts_count.short_description = 'Active Contracts'
+    active_contracts_count.admin_order_field = '_active_contracts_count'
     
     def active_contracts_display(self, obj):
         """Display list of employees with active contracts for this role"""
         from django.urls import reverse
         from django.utils.safestring import mark_safe
         
-        # Get all contracts and filter for active ones
-        active_contracts = [c for c in obj.contracts.all() if c.is_active_contract]
+        # Active contracts sorted by employee last name
+        active_contracts = list(
+            obj.contracts.active_on().select_related('employee').order_by('employee__last_name')
+        )
         
         if not active_contracts:
             return mark_safe("<em>No active contracts</em>")
         
-        # Sort by employee last name
-        active_contracts.sort(key=lambda c: c.employee.last_name)
-        
         contracts_info = []
         for contract in active_contracts:
             # Create employee link
@@ -128,14 +137,13 @@ class RoleAdmin(BaseModelAdminMixin):
         from django.urls import reverse
         from django.utils.safestring import mark_safe
         
-        # Get all contracts and filter for inactive ones
-        historical_contracts = [c for c in obj.contracts.all() if not c.is_active_contract]
+        historical_contracts = obj.contracts.historical().select_related('employee').order_by('-effective_from')
+        historical_count = historical_contracts.count()
         
-        if not historical_contracts:
+        if not historical_count:
             return mark_safe("<em>No historical contracts</em>")
         
-        # Sort by most recent first, limit to 10
-        historical_contracts.sort(key=lambda c: c.effective_from, reverse=True)
+        # Most recent first, limit to 10
         recent_historical = historical_contracts[:10]
         
         contracts_info = []
@@ -160,9 +168,9 @@ class RoleAdmin(BaseModelAdminMixin):
             )
         
         # Add note if there are more historical contracts
-        if len(historical_contracts) > 10:
+        if historical_count > 10:
             contracts_info.append(
-                f"<em>... and {len(historical_contracts) - 10} more historical contracts</em>"
+                f"<em>... and {historical_count - 10} more historical contracts</em>"
             )
         
         return mark_safe("<br>".join(contracts_info))
@@ -117,8 +117,7 @@ class TeamAdmin(BaseModelAdminMixin):
         if obj.is_root_team:
             info.append('🌳 <strong>Root Team</strong>')
         else:
-            ancestors = obj.get_all_ancestors()
-            info.append(f'⬆️ {len(ancestors)} level(s) up to root')
+            info.append(f'⬆️ {obj.depth} level(s) up to root')
         
         descendants = obj.get_all_descendants()
         if descendants:
@@ -134,12 +133,11 @@ class TeamAdmin(BaseModelAdminMixin):
     def show_team_hierarchy(self, request, queryset):
         """Show team hierarchy information"""
         for team in queryset:
-            ancestors = team.get_all_ancestors()
             descendants = team.get_all_descendants()
             
             self.message_user(
                 request, 
-                f"{team.team_name}: {len(ancestors)} ancestors, {len(descendants)} descendants, "
+                f"{team.team_name}: {team.depth} ancestors, {len(descendants)} descendants, "
                 f"level {team.level}, {team.get_team_size()} members"
             )
     show_team_hierarchy.short_description = 'Show hierarchy info for selected teams'
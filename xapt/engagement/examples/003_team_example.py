@@ -19,8 +19,6 @@ python3 003_team_example.py
 
 import os
 import sys
-from datetime import date, datetime, timedelta
-import pandas as pd
 
 # === PATH SETUP ===
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -45,6 +43,8 @@ django.setup()
 try:
     from utils.query_runner.query_runner import QueryRunner
     from engagement.models import Employee, Team, TeamMembership, Role, Contract, Manager, PerformanceReview
+    from engagement.models.base_model_utils.query_loader import load_instances_from_query
+    from engagement.models.base_model_utils.relation_loader import link_parents
     print("✅ Successfully imported Employee, Team, and TeamMembership models")
 except ImportError as e:
     print(f"❌ Failed to import: {e}")
@@ -215,6 +215,7 @@ def create_job_roles_with_query():
 
 
 def set_parent_teams():
+    """Link every team to its parent with one index lookup and a bulk update"""
     query = """
     SELECT
         team_id as factorial_id,
@@ -226,112 +227,53 @@ def set_parent_teams():
     query_runner = QueryRunner()
     result = query_runner.run_query(query, source='postgres', dataframe=True)
     
-    teams = Team.objects.all()
-
-
-    for _, row in result.iterrows():
-        # Convert row to dict to ensure we have clean Python values
-        row_dict = row.to_dict()
-        
-        # Find the team and parent team
-        team = next((team for team in teams if team.factorial_id == row_dict['factorial_id']), None)
-        parent_team = next((team for team in teams if team.factorial_id == row_dict['factorial_parent_team_id']), None)
-        
-        if team is None:
-            print(f"  ⚠️  Team with factorial_id {row_dict['factorial_id']} not found")
-            continue
-            
-        if parent_team is None:
-            print(f"  ⚠️  Parent team with factorial_id {row_dict['factorial_parent_team_id']} not found")
-            continue
-        
-        team.parent_team = parent_team
-        team.save()
-        print(f"  🔗 Linked {team.team_name} to {parent_team.team_name}")
+    return link_parents(
+        Team,
+        result.to_dict('records'),
+        child_column='factorial_id',
+        parent_column='factorial_parent_team_id',
+        parent_field='parent_team'
+    )
     
 
 def create_memberships_with_query():
-    """Create team memberships using direct QueryRunner (since TeamMembership doesn't inherit from BaseModel)"""
-    
-    print("\n📋 Creating team memberships using QueryRunner...")
+    """Create team memberships in bulk, resolving employees and teams by factorial_id"""
     
-    try:
-        # Import PAE QueryRunner directly
-        from utils.query_runner.query_runner import QueryRunner
-
-        query = """
-        select
-            employee_id as employee_factorial_id,
-            team_id as team_factorial_id,
-            is_lead as is_lead,
-            effective_from as effective_from,
-            effective_to as effective_to
-        from slv_memberships_cdc        
-        """
-
-        query_runner = QueryRunner()
-        result = query_runner.run_query(query, source='postgres', dataframe=True)
-        
+    print("\n📋 Creating team memberships in bulk...")
 
-        employees = Employee.objects.all()
-        teams = Team.objects.all()
-        
-        memberships = []
+    query = """
+    select
+        employee_id as employee_factorial_id,
+        team_id as team_factorial_id,
+        is_lead as is_lead,
+        effective_from as effective_from,
+        effective_to as effective_to
+    from slv_memberships_cdc        
+    """
+
+    # TeamMembership doesn't inherit from BaseModel, so use the query loader directly
+    result = load_instances_from_query(
+        TeamMembership,
+        query,
+        foreign_keys={
+            'employee_factorial_id': ('employee', Employee),
+            'team_factorial_id': ('team', Team),
+        },
+        unique_fields=['employee', 'team', 'effective_from'],
+        create_if_not_exists=True,
+        update_existing=False,
+        bulk=True
+    )
+    print(f"  📈 Created: {result.get('created', 0)}, ⚠️ Failed: {result.get('failed', 0)}")
+    return result.get('instances', [])
 
-        for _, row in result.iterrows():
-            # Convert row to dict to ensure we have clean Python values
-            row_dict = row.to_dict()
-            
-            # Find the employee and team
-            employee = next((emp for emp in employees if emp.factorial_id == row_dict['employee_factorial_id']), None)
-            team = next((team for team in teams if team.factorial_id == row_dict['team_factorial_id']), None)
-
-            if employee is None:
-                print(f"  ⚠️  Employee with factorial_id {row_dict['employee_factorial_id']} not found")
-                continue
-            if team is None:
-                print(f"  ⚠️  Team with factorial_id {row_dict['team_factorial_id']} not found")
-                continue
-            
-            try:
-                membership, created = TeamMembership.objects.get_or_create(
-                    employee=employee,
-                    team=team,
-                    effective_from=row_dict['effective_from'],
-                    defaults={
-                        'effective_to': row_dict['effective_to'],
-                        'is_lead': row_dict['is_lead']
-                    }
-                )
-                memberships.append(membership)
-                
-                if created:
-                    role = " (Lead)" if row_dict['is_lead'] else " (Member)"
-                    print(f"  ✅ Created {employee.full_name} → {team.team_name}{role}")
-                else:
-                    print(f"  ⏭️  Skipped existing membership: {employee.full_name} → {team.team_name}")
-                    
-            except Exception as e:
-                print(f"  ⚠️  Failed to create membership for {employee.full_name} → {team.team_name}: {str(e)}")
-                print(f"     Continuing with next membership...")
-                continue
-        return memberships
-    except ImportError as e:
-        print(f"❌ QueryRunner not available: {e}")
-        print("📝 Falling back to regular Django ORM creation...")
-        
-        # Fallback to original method if QueryRunner not available
-        return create_memberships_fallback(employees, teams)
-    
-    except Exception as e:
-        print(f"❌ Query execution failed: {e}")
 
 def create_contracts_with_query():
     query = """
     select
-        contract_id as contract_factorial_id,
+        contract_id as factorial_id,
         employee_id as employee_factorial_id,
-        job_title as public_job_title,
+        job_title,
         effective_date as effective_from,
         effective_to_date as effective_to,
         salary_amount,
@@ -342,45 +284,19 @@ def create_contracts_with_query():
 
     delete_contracts = Contract.objects.all().delete()
 
-    query_runner = QueryRunner()
-    result = query_runner.run_query(query, source='postgres', dataframe=True)
-
-    for _, row in result.iterrows():
-        # Convert row to dict to ensure we have clean Python values
-        row_dict = row.to_dict()
-        
-        # Find the employee and role
-        employee = Employee.objects.filter(factorial_id=row_dict['employee_factorial_id']).first()
-        role = Role.objects.filter(factorial_id=row_dict['job_catalog_level_factorial_id']).first()
-
-        if employee is None:
-            print(f"  ⚠️  Employee with factorial_id {row_dict['employee_factorial_id']} not found")
-            continue
-        if role is None:
-            print(f"  ⚠️  Role with factorial_id {row_dict['job_catalog_level_factorial_id']} not found")
-            continue
-        
-        try:
-            contract, created = Contract.objects.get_or_create(
-                employee=employee,
-                role=role,
-                effective_from=row_dict['effective_from'],
-                defaults={
-                    'effective_to': row_dict['effective_to'],
-                    'salary_amount': row_dict['salary_amount'],
-                    'job_title': row_dict['public_job_title']
-                }
-            )
-            
-            if created:
-                print(f"  ✅ Created contract for {employee.full_name} - {role.role_name}")
-            else:
-                print(f"  ⏭️  Skipped existing contract for {employee.full_name} - {role.role_name}")
-                
-        except Exception as e:
-            print(f"  ⚠️  Failed to create contract for {employee.full_name} - {role.role_name}: {str(e)}")
-            print(f"     Continuing with next contract...")
-            continue
+    result = Contract.load_from_query(
+        query=query,
+        foreign_keys={
+            'employee_factorial_id': ('employee', Employee),
+            'job_catalog_level_factorial_id': ('role', Role),
+        },
+        unique_fields=['employee', 'role', 'effective_from'],
+        create_if_not_exists=True,
+        update_existing=False,
+        bulk=True
+    )
+    print(f"  📈 Created: {result.get('created', 0)} contracts, ⚠️ Failed: {result.get('failed', 0)}")
+    return result.get('instances', [])
 
 def create_managers_with_query():
     query = """
@@ -393,58 +309,32 @@ from
     br_athena_employee_managers_cdc
     """
 
-    query_runner = QueryRunner()
-    result = query_runner.run_query(query, source='postgres', dataframe=True)
-    
-    for _, row in result.iterrows():
-        # Convert row to dict to ensure we have clean Python values
-        row_dict = row.to_dict()
-        
-        # Find the employee and manager
-        employee = Employee.objects.filter(factorial_id=row_dict['factorial_employee_id']).first()
-        manager = Employee.objects.filter(factorial_id=row_dict['factorial_manager_id']).first()
-
-        if employee is None:
-            print(f"  ⚠️  Employee with factorial_id {row_dict['factorial_employee_id']} not found")
-            continue
-        if manager is None:
-            print(f"  ⚠️  Manager with factorial_id {row_dict['factorial_manager_id']} not found")
-            continue
-        
-        try:
-            manager_record, created = Manager.objects.get_or_create(
-                employee=employee,
-                effective_from=row_dict['effective_from'],
-                defaults={
-                    'manager': manager,
-                    'effective_to': row_dict['effective_to']
-                }
-            )
-            
-            if created:
-                print(f"  ✅ Created manager {manager.full_name} for {employee.full_name}")
-            else:
-                print(f"  ⏭️  Skipped existing manager record for {employee.full_name}")
-                
-        except Exception as e:
-            print(f"  ⚠️  Failed to create manager record for {employee.full_name}: {str(e)}")
-            print(f"     Continuing with next record...")
-            continue
+    result = Manager.load_from_query(
+        query=query,
+        foreign_keys={
+            'factorial_employee_id': ('employee', Employee),
+            'factorial_manager_id': ('manager', Employee),
+        },
+        unique_fields=['employee', 'effective_from'],
+        create_if_not_exists=True,
+        update_existing=False,
+        bulk=True
+    )
+    print(f"  📈 Created: {result.get('created', 0)} manager records, ⚠️ Failed: {result.get('failed', 0)}")
+    return result.get('instances', [])
 
 
 def create_performance_reviews_with_query():
     query = '''
     select
-        performance_review_name,
+        performance_review_name as performance_name,
         employee_id,
-        performance_review_start_date,
+        performance_review_start_date as performance_date,
         manager_employee_id,
-        concat(self_employee_score_questionnaire_answered, '/', self_review_questionnaire_answered) as employee_answers,
-        concat(manager_employee_score_questionnaire_answered, '/', manager_review_questionnaire_answered) as manager_answers,
+        concat(self_employee_score_questionnaire_answered, '/', self_review_questionnaire_answered) as self_questionary,
+        concat(manager_employee_score_questionnaire_answered, '/', manager_review_questionnaire_answered) as manager_questionary,
         self_score,
-        manager_score,
-        final_employee_score,
-        final_score_calculated_at
+        final_employee_score as overall_score
     from 
         slv_performance_reviews
     where
@@ -453,55 +343,20 @@ def create_performance_reviews_with_query():
 
     performance_reviews = PerformanceReview.objects.all().delete()
 
-    query_runner = QueryRunner()
-    result = query_runner.run_query(query, source='postgres', dataframe=True)
-
-    for _, row in result.iterrows():
-        # Convert row to dict to ensure we have clean Python values
-        row_dict = row.to_dict()
-        
-        # Find the employee
-        employee = Employee.objects.filter(factorial_id=row_dict['employee_id']).first()
-        manager = Employee.objects.filter(factorial_id=row_dict['manager_employee_id']).first()
-
-        if employee is None:
-            print(f"  ⚠️  Employee with factorial_id {row_dict['employee_id']} not found")
-            continue
-        if manager is None:
-            print(f"  ⚠️  Manager with factorial_id {row_dict['manager_employee_id']} not found")
-            continue
-
-        try:
-            self_score = row_dict['self_score']
-            manager_score = row_dict['final_employee_score']
-
-            if pd.isna(self_score):
-                self_score = None
-            if pd.isna(manager_score):
-                manager_score = None
-
-            review, created = PerformanceReview.objects.update_or_create(
-                employee=employee,
-                performance_name=row_dict['performance_review_name'],
-                performance_date=row_dict['performance_review_start_date'],
-                defaults={
-                    'self_questionary': row_dict['employee_answers'],
-                    'manager_questionary': row_dict['manager_answers'],
-                    'overall_score': manager_score,
-                    'self_score': self_score,
-                    'manager': manager
-                }
-            )
-            
-            if created:
-                print(f"  ✅ Created performance review '{row_dict['performance_review_name']}' for {employee.full_name}")
-            else:
-                print(f"  ⏭️  Updated existing performance review '{row_dict['performance_review_name']}' for {employee.full_name}")
-                
-        except Exception as e:
-            print(f"  ⚠️  Failed to create performance review for {employee.full_name}: {str(e)}")
-            print(f"     Continuing with next record...")
-            continue
+    result = PerformanceReview.load_from_query(
+        query=query,
+        foreign_keys={
+            'employee_id': ('employee', Employee),
+            'manager_employee_id': ('manager', Employee),
+        },
+        unique_fields=['employee', 'performance_name', 'performance_date'],
+        create_if_not_exists=True,
+        update_existing=True,
+        bulk=True
+    )
+    print(f"  📈 Created: {result.get('created', 0)}, 🔄 Updated: {result.get('updated', 0)} performance reviews, "
+          f"⚠️ Failed: {result.get('failed', 0)}")
+    return result.get('instances', [])
 
 
 
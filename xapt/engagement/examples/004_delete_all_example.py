@@ -20,7 +20,6 @@ Key concepts:
 
 import os
 import sys
-from datetime import date
 import django
 
 # Set up the path to include both xapt project and PAE root
@@ -52,7 +51,7 @@ def show_current_counts():
     
     # TeamMembership counts
     total_memberships = TeamMembership.objects.count()
-    active_memberships = TeamMembership.objects.filter(effective_to__gte=date.today()).count()
+    active_memberships = TeamMembership.objects.active_on().count()
     lead_memberships = TeamMembership.objects.filter(is_lead=True).count()
     
     print(f"👥 TeamMemberships: {total_memberships} total")
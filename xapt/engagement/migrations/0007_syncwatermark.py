@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0006_performancereview_self_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Identifier of the sync (e.g. 'tairtable_employees')", max_length=100, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, help_text='Changes up to this time have been synced', null=True)),
+                ('records_synced', models.PositiveIntegerField(default=0, help_text='Records applied by the last sync')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sync Watermark',
+                'verbose_name_plural': 'Sync Watermarks',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0007_syncwatermark'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['employee', 'effective_from', 'effective_to'], name='membership_emp_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['team', 'effective_from', 'effective_to'], name='membership_team_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manager',
+            index=models.Index(fields=['employee', 'effective_from', 'effective_to'], name='manager_emp_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manager',
+            index=models.Index(fields=['manager', 'effective_from', 'effective_to'], name='manager_mgr_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['employee', 'effective_from', 'effective_to'], name='contract_emp_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['role', 'effective_from', 'effective_to'], name='contract_role_period_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+def backfill_team_paths(apps, schema_editor):
+    """Compute path and depth of the existing teams from parent_team"""
+    Team = apps.get_model('engagement', 'Team')
+    teams = Team.objects.using(schema_editor.connection.alias)
+    parents = dict(teams.values_list('pk', 'parent_team_id'))
+
+    paths = {}
+    for pk in parents:
+        chain = []
+        current = pk
+        while current is not None and current not in paths:
+            if current in chain:
+                # Existing cycle: break it above the last team walked, which becomes a root
+                print(f"  ⚠️  Circular team hierarchy: team {chain[-1]} stored as a root "
+                      f"(its parent {current} is part of the cycle)")
+                current = None
+                break
+            chain.append(current)
+            parent_id = parents[current]
+            current = parent_id if parent_id in parents else None
+        path = paths[current] if current is not None else '/'
+        for node in reversed(chain):
+            path = f"{path}{node}/"
+            paths[node] = path
+
+    teams.bulk_update(
+        [Team(pk=pk, path=path, depth=path.count('/') - 2) for pk, path in paths.items()],
+        ['path', 'depth'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0008_effective_period_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, help_text="Primary keys from the root down to this team, e.g. '/1/5/12/'", max_length=500),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of ancestors (0 for root teams)'),
+        ),
+        migrations.RunPython(backfill_team_paths, migrations.RunPython.noop),
+    ]
@@ -8,5 +8,6 @@ from .role import Role
 from .contract import Contract
 from .manager import Manager
 from .performance_review import PerformanceReview
+from .sync_watermark import SyncWatermark
 
-__all__ = ['BaseModel', 'RelatedModel', 'Employee', 'Team', 'TeamMembership', 'Role', 'Contract', 'Manager', 'PerformanceReview']
+__all__ = ['BaseModel', 'RelatedModel', 'Employee', 'Team', 'TeamMembership', 'Role', 'Contract', 'Manager', 'PerformanceReview', 'SyncWatermark']
@@ -40,7 +40,10 @@ class BaseModel(models.Model):
                        field_mapping: dict = None,
                        create_if_not_exists: bool = True,
                        update_existing: bool = False,
-                       unique_fields: list = None):
+                       unique_fields: list = None,
+                       bulk: bool = False,
+                       batch_size: int = 1000,
+                       foreign_keys: dict = None):
         """
         Load multiple instances of this model from a SQL query.
         
@@ -53,6 +56,11 @@ class BaseModel(models.Model):
             create_if_not_exists (bool): Create new instances if they don't exist
             update_existing (bool): Update existing instances with new data
             unique_fields (list): Fields to use for checking existing instances
+            bulk (bool): Upsert set-wise with bulk_create/bulk_update in one transaction
+                         instead of one lookup and save per row
+            batch_size (int): Rows per bulk query when bulk=True
+            foreign_keys (dict): {column: (fk_field, related_model)} Factorial ID columns
+                                 resolved to related instances through one index per model
             
         Returns:
             dict: Result summary with created/updated/failed counts and instances
@@ -76,7 +84,10 @@ class BaseModel(models.Model):
                 field_mapping=field_mapping,
                 create_if_not_exists=create_if_not_exists,
                 update_existing=update_existing,
-                unique_fields=unique_fields or ['email'] if hasattr(cls, 'email') else ['id']
+                unique_fields=unique_fields or (['email'] if hasattr(cls, 'email') else ['id']),
+                bulk=bulk,
+                batch_size=batch_size,
+                foreign_keys=foreign_keys
             )
             
         except ImportError as e:
@@ -8,8 +8,14 @@ from the results.
 
 import sys
 import os
-from typing import List, Dict, Any, Optional, Type
-from django.db import models
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Type
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from .relation_loader import resolve_foreign_keys
 
 # Add PAE project root to Python path to access utils modules
 PAE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
@@ -33,6 +39,9 @@ class QueryLoader:
     2. Mapping query results to model fields
     3. Creating model instances from query data
     4. Handling errors and validation
+    
+    With bulk=True rows are upserted set-wise (see _process_query_results_bulk)
+    instead of one lookup and one save per row.
     """
     
     def __init__(self, model_class: Type[models.Model]):
@@ -54,7 +63,10 @@ class QueryLoader:
                                 field_mapping: Optional[Dict[str, str]] = None,
                                 create_if_not_exists: bool = True,
                                 update_existing: bool = True,
-                                unique_fields: List[str] = None) -> Dict[str, Any]:
+                                unique_fields: List[str] = None,
+                                bulk: bool = False,
+                                batch_size: int = 1000,
+                                foreign_keys: Optional[Dict[str, Tuple[str, Type[models.Model]]]] = None) -> Dict[str, Any]:
         """
         Load model instances from a SQL query.
         
@@ -65,6 +77,14 @@ class QueryLoader:
             create_if_not_exists (bool): Create new instances if they don't exist
             update_existing (bool): Update existing instances with new data
             unique_fields (list): Fields to use for checking existing instances
+            bulk (bool): Prefetch existing instances in one query and write with
+                         bulk_create/bulk_update in batches, in one transaction
+            batch_size (int): Rows per bulk query when bulk=True
+            foreign_keys (dict): {column: (fk_field, related_model)} for columns holding the
+                                 Factorial ID of a related instance, e.g.
+                                 {'employee_factorial_id': ('employee', Employee)}. They are
+                                 resolved through one index per related model (see
+                                 relation_loader); rows that cannot be resolved count as failed
             
         Returns:
             dict: Result summary with created/updated/failed counts and instances
@@ -100,15 +120,35 @@ class QueryLoader:
             print(f"📊 Query returned {len(df)} rows")
             print(f"📋 Columns: {list(df.columns)}")
             print(df)
+            
+            unresolved_count = 0
+            if foreign_keys:
+                total_rows = len(df)
+                df, _ = resolve_foreign_keys(df, self.model_class, foreign_keys)
+                unresolved_count = total_rows - len(df)
+            
             # Process results
-            result = self._process_query_results(
-                df, 
-                field_mapping or {},
-                create_if_not_exists,
-                update_existing,
-                unique_fields or ['id']
-            )
+            if bulk:
+                result = self._process_query_results_bulk(
+                    df,
+                    field_mapping or {},
+                    create_if_not_exists,
+                    update_existing,
+                    unique_fields or ['id'],
+                    batch_size
+                )
+            else:
+                result = self._process_query_results(
+                    df, 
+                    field_mapping or {},
+                    create_if_not_exists,
+                    update_existing,
+                    unique_fields or ['id']
+                )
             
+            if unresolved_count:
+                result['failed'] += unresolved_count
+                result['total_rows'] = result.get('total_rows', 0) + unresolved_count
             return result
             
         except Exception as e:
@@ -188,6 +228,241 @@ class QueryLoader:
             'instances': instances
         }
     
+    def _process_query_results_bulk(self, df, field_mapping: Dict[str, str],
+                                    create_if_not_exists: bool,
+                                    update_existing: bool,
+                                    unique_fields: List[str],
+                                    batch_size: int) -> Dict[str, Any]:
+        """
+        Set-wise version of _process_query_results.
+        
+        Existing instances are fetched in batches keyed on unique_fields, rows are split into
+        create and update sets and written with bulk_create / bulk_update inside one
+        transaction. When unique_fields are enforced unique by the database, bulk_create uses
+        update_conflicts=True so rows inserted concurrently are updated instead of failing;
+        those rows are still counted as created, and the summary sets created_approximate.
+        Rows sharing the same key are collapsed (the last one wins). NULL key parts match
+        NULL columns, like the row-by-row path. Returns the same summary as
+        _process_query_results.
+        """
+        
+        model = self.model_class
+        model_name = model.__name__
+        print(f"🔧 Bulk processing {len(df)} rows for {model_name}")
+        
+        # Rows carry foreign keys as '<field>_id', so key on attribute names
+        unique_fields = [model._meta.get_field(field).attname for field in unique_fields]
+        
+        # NaN/NaT become None so nullable fields store NULL
+        rows = df.astype(object).where(df.notna(), None).to_dict('records')
+        rows = [self._map_fields(row, field_mapping) for row in rows]
+        
+        field_names = {field.name for field in model._meta.concrete_fields} | \
+                      {field.attname for field in model._meta.concrete_fields}
+        unknown_columns = sorted({column for row in rows for column in row} - field_names)
+        if unknown_columns:
+            return {
+                'success': False,
+                'error': f'Columns {unknown_columns} are not fields of {model_name}',
+                'created': 0,
+                'updated': 0,
+                'failed': len(rows),
+                'total_rows': len(rows),
+                'instances': []
+            }
+        
+        # Collapse rows on their key; rows missing a key column are always new. NULL key
+        # parts are kept and matched with IS NULL, as _find_existing_instance does
+        key_fields = {field.attname: field for field in model._meta.concrete_fields}
+        keyed_rows = {}
+        unkeyed_rows = []
+        for row in rows:
+            if all(field in row for field in unique_fields):
+                # Key values in the Python types Django loads, so they match existing instances
+                for field in unique_fields:
+                    row[field] = self._normalize_key_value(key_fields[field], row[field])
+                keyed_rows[tuple(row[field] for field in unique_fields)] = row
+            else:
+                unkeyed_rows.append(row)
+        
+        existing = self._prefetch_existing(list(keyed_rows), unique_fields, batch_size)
+        
+        now = timezone.now()
+        has_updated_at = 'updated_at' in field_names
+        to_create = []
+        to_update = []
+        skipped = []
+        update_fields = set()
+        failed_count = 0
+        
+        for key, row in keyed_rows.items():
+            instance = existing.get(key)
+            if instance is None:
+                if create_if_not_exists:
+                    to_create.append(model(**row))
+                else:
+                    failed_count += 1
+            elif update_existing:
+                for field, value in row.items():
+                    setattr(instance, field, value)
+                update_fields.update(field for field in row if field not in unique_fields)
+                to_update.append(instance)
+            else:
+                skipped.append(instance)
+        
+        if create_if_not_exists:
+            to_create.extend(model(**row) for row in unkeyed_rows)
+        else:
+            failed_count += len(unkeyed_rows)
+        
+        if has_updated_at and to_update:
+            # bulk_update bypasses save(), so auto_now is not applied
+            for instance in to_update:
+                instance.updated_at = now
+            update_fields.add('updated_at')
+        update_fields.discard(model._meta.pk.name)
+        
+        using = router.db_for_write(model)
+        create_kwargs = {}
+        if to_create and update_existing and self._unique_fields_enforced(unique_fields, using):
+            conflict_fields = sorted({field for row in rows for field in row} - set(unique_fields)
+                                     - {model._meta.pk.name, 'created_at'})
+            if has_updated_at and 'updated_at' not in conflict_fields:
+                conflict_fields.append('updated_at')
+            if conflict_fields:
+                create_kwargs = {
+                    'update_conflicts': True,
+                    'unique_fields': unique_fields,
+                    'update_fields': conflict_fields,
+                }
+        
+        try:
+            with transaction.atomic(using=using):
+                if to_create:
+                    model.objects.using(using).bulk_create(to_create, batch_size=batch_size, **create_kwargs)
+                if to_update and update_fields:
+                    model.objects.using(using).bulk_update(to_update, sorted(update_fields), batch_size=batch_size)
+                # bulk writes bypass save(), so refresh derived hierarchy data (Team.path)
+                if (to_create or to_update) and hasattr(model, 'rebuild_paths'):
+                    model.rebuild_paths(using=using)
+        except Exception as e:
+            print(f"  ❌ Bulk write failed, nothing was saved: {e}")
+            return {
+                'success': False,
+                'error': f'Bulk write failed: {str(e)}',
+                'created': 0,
+                'updated': 0,
+                'failed': len(rows),
+                'total_rows': len(rows),
+                'instances': []
+            }
+        
+        # Rows inserted concurrently are updated by update_conflicts but cannot be told
+        # apart from inserts, so 'created' is an upper bound in that case
+        created_approximate = bool(create_kwargs)
+        message = f'Processed {len(df)} rows successfully'
+        if created_approximate:
+            message += ' (created count includes rows updated on conflict)'
+        
+        print(f"  ✅ Created {len(to_create)}{' (at most)' if created_approximate else ''}, "
+              f"updated {len(to_update)}, skipped {len(skipped)}"
+              + (f", failed {failed_count}" if failed_count else ""))
+        return {
+            'success': True,
+            'message': message,
+            'created_approximate': created_approximate,
+            'created': len(to_create),
+            'updated': len(to_update),
+            'failed': failed_count,
+            'total_rows': len(df),
+            'instances': to_create + to_update + skipped
+        }
+    
+    @staticmethod
+    def _normalize_key_value(field: models.Field, value):
+        """
+        Convert a raw query value to the Python value Django loads for field, so lookup keys
+        built from query rows and from model instances compare equal (e.g. an int factorial_id
+        vs the CharField string, a pandas Timestamp vs the date of a DateField).
+        """
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer() and isinstance(field, (models.CharField, models.TextField)):
+            # Integer IDs read as floats because of NULLs in the column
+            value = int(value)
+        if hasattr(value, 'to_pydatetime'):
+            value = value.to_pydatetime()
+        try:
+            value = field.to_python(value)
+        except ValidationError:
+            return value
+        if isinstance(value, datetime) and settings.USE_TZ and timezone.is_naive(value):
+            # Same interpretation as saving a naive datetime
+            value = timezone.make_aware(value)
+        return value
+    
+    def _prefetch_existing(self, keys: List[tuple], unique_fields: List[str], batch_size: int) -> Dict[tuple, Any]:
+        """
+        Fetch existing instances for keys in batches, indexed by their unique_fields tuple.
+        
+        Keys are grouped by which parts are NULL: those parts are filtered with __isnull,
+        the first non-NULL part with __in, and composite keys are matched in Python.
+        """
+        
+        existing = {}
+        key_fields = {field.attname: field for field in self.model_class._meta.concrete_fields}
+        
+        groups = {}
+        for key in keys:
+            null_parts = tuple(value is None for value in key)
+            groups.setdefault(null_parts, []).append(key)
+        
+        for null_parts, group_keys in groups.items():
+            null_filter = {
+                f'{field}__isnull': True
+                for field, is_null in zip(unique_fields, null_parts) if is_null
+            }
+            narrow_index = next((i for i, is_null in enumerate(null_parts) if not is_null), None)
+            for i in range(0, len(group_keys), batch_size):
+                batch_keys = group_keys[i:i + batch_size]
+                wanted = set(batch_keys)
+                queryset = self.model_class.objects.filter(**null_filter)
+                if narrow_index is not None:
+                    queryset = queryset.filter(**{
+                        f'{unique_fields[narrow_index]}__in': {key[narrow_index] for key in batch_keys}
+                    })
+                for instance in queryset:
+                    key = tuple(
+                        self._normalize_key_value(key_fields[field], getattr(instance, field))
+                        for field in unique_fields
+                    )
+                    if key in wanted:
+                        existing[key] = instance
+        return existing
+    
+    def _unique_fields_enforced(self, unique_fields: List[str], using: str) -> bool:
+        """Whether the database enforces uniqueness on unique_fields, as update_conflicts requires."""
+        
+        if not connections[using].features.supports_update_conflicts_with_target:
+            return False
+        
+        meta = self.model_class._meta
+        try:
+            fields = [meta.get_field(field_name) for field_name in unique_fields]
+        except Exception:
+            return False
+        wanted = {field.name for field in fields}
+        if len(fields) == 1 and fields[0].unique:
+            return True
+        
+        for together in meta.unique_together:
+            if set(together) == wanted:
+                return True
+        for constraint in meta.total_unique_constraints:
+            if set(constraint.fields) == wanted:
+                return True
+        return False
+    
     def _map_fields(self, row_data: Dict[str, Any], field_mapping: Dict[str, str]) -> Dict[str, Any]:
         """Map query columns to model fields."""
         
@@ -231,7 +506,10 @@ def load_instances_from_query(model_class: Type[models.Model],
                             field_mapping: Optional[Dict[str, str]] = None,
                             create_if_not_exists: bool = True,
                             update_existing: bool = False,
-                            unique_fields: List[str] = None) -> Dict[str, Any]:
+                            unique_fields: List[str] = None,
+                            bulk: bool = False,
+                            batch_size: int = 1000,
+                            foreign_keys: Optional[Dict[str, Tuple[str, Type[models.Model]]]] = None) -> Dict[str, Any]:
     """
     Convenient function to load instances from query without creating QueryLoader instance.
     
@@ -242,6 +520,9 @@ def load_instances_from_query(model_class: Type[models.Model],
         create_if_not_exists: Whether to create new instances
         update_existing: Whether to update existing instances  
         unique_fields: Fields for finding existing instances
+        bulk: Upsert set-wise with bulk_create/bulk_update
+        batch_size: Rows per bulk query when bulk=True
+        foreign_keys: {column: (fk_field, related_model)} Factorial ID columns to resolve
         
     Returns:
         dict: Result summary
@@ -253,7 +534,10 @@ def load_instances_from_query(model_class: Type[models.Model],
         field_mapping=field_mapping,
         create_if_not_exists=create_if_not_exists,
         update_existing=update_existing,
-        unique_fields=unique_fields
+        unique_fields=unique_fields,
+        bulk=bulk,
+        batch_size=batch_size,
+        foreign_keys=foreign_keys
     )
 
 
@@ -0,0 +1,168 @@
+"""
+Relation Loader Utility
+
+Set-based helpers to import relations keyed on Factorial IDs (teams, memberships,
+contracts, managers, performance reviews...).
+
+Foreign keys are resolved through dict indexes built with one query per related
+model instead of a lookup (or a linear scan) per row, so an import costs a handful
+of queries whatever its size. Used by QueryLoader through its foreign_keys option.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import pandas as pd
+from django.db import models, transaction
+from django.utils import timezone
+
+
+def factorial_key(value) -> Optional[str]:
+    """
+    Normalize a Factorial ID coming from a query to the string stored in factorial_id.
+    Integer IDs read as floats (because of NULLs in the column) lose their '.0'.
+    """
+    if value is None or value != value:  # None or NaN
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def build_factorial_index(model_class: Type[models.Model], factorial_ids=None,
+                          key_field: str = 'factorial_id', batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Build a {factorial_id: pk} index for a model.
+
+    Args:
+        model_class: Model to index
+        factorial_ids: Only index these IDs (fetched in batches); all rows when None
+        key_field: Field holding the external ID
+        batch_size: IDs per query when factorial_ids is given
+
+    Returns:
+        dict: Normalized external ID -> primary key
+    """
+    queryset = model_class.objects.exclude(**{f'{key_field}__isnull': True})
+    if factorial_ids is None:
+        return {factorial_key(key): pk for key, pk in queryset.values_list(key_field, 'pk')}
+
+    keys = sorted({key for key in map(factorial_key, factorial_ids) if key is not None})
+    index = {}
+    for i in range(0, len(keys), batch_size):
+        batch = keys[i:i + batch_size]
+        index.update(
+            (factorial_key(key), pk)
+            for key, pk in queryset.filter(**{f'{key_field}__in': batch}).values_list(key_field, 'pk')
+        )
+    return index
+
+
+def resolve_foreign_keys(df, model_class: Type[models.Model],
+                         foreign_keys: Dict[str, Tuple[str, Type[models.Model]]],
+                         key_field: str = 'factorial_id'):
+    """
+    Replace Factorial ID columns by the primary keys of the related instances.
+
+    Args:
+        df: Query results
+        model_class: Model being loaded (used for the FK attribute names)
+        foreign_keys: {column: (fk_field, related_model)}, e.g.
+                      {'employee_factorial_id': ('employee', Employee)}
+        key_field: Field holding the external ID on the related models
+
+    Returns:
+        tuple: (DataFrame with one '<fk_field>_id' column per foreign key, restricted to rows whose
+               required foreign keys all resolved, {column: unresolved row count})
+    """
+    df = df.copy()
+    keep = None
+    unresolved = {}
+    indexes = {}
+
+    for column, (field_name, related_model) in foreign_keys.items():
+        field = model_class._meta.get_field(field_name)
+        if related_model not in indexes:
+            # One index per related model, shared by all the columns pointing to it
+            related_columns = [col for col, (_, model) in foreign_keys.items() if model is related_model]
+            ids = set()
+            for related_column in related_columns:
+                ids.update(df[related_column].tolist())
+            indexes[related_model] = build_factorial_index(related_model, ids, key_field=key_field)
+        index = indexes[related_model]
+
+        keys = df[column].map(factorial_key)
+        pks = [index.get(key) if key is not None else None for key in keys]
+        missing = keys.notna() & pd.Series([pk is None for pk in pks], index=df.index)
+        if not field.null:
+            missing |= keys.isna()
+        if missing.any():
+            unresolved[column] = int(missing.sum())
+            sample = keys[missing].dropna().unique()[:5].tolist()
+            print(f"  ⚠️  {unresolved[column]} rows with unknown {related_model.__name__} in '{column}'"
+                  + (f" (e.g. {sample})" if sample else ""))
+        keep = ~missing if keep is None else keep & ~missing
+
+        df = df.drop(columns=[column])
+        df[field.attname] = pd.Series(pks, index=df.index, dtype=object)
+
+    if keep is not None:
+        df = df[keep.values]
+    return df, unresolved
+
+
+def link_parents(model_class: Type[models.Model], rows: List[Dict[str, Any]],
+                 child_column: str = 'factorial_id', parent_column: str = 'factorial_parent_id',
+                 parent_field: str = 'parent_team', key_field: str = 'factorial_id',
+                 batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Set self-referencing parent links (e.g. Team.parent_team) for many rows at once.
+
+    Children and parents are resolved through one Factorial ID index and the links are
+    written with bulk_update in a single transaction, followed by rebuild_paths() for
+    models that maintain a materialized hierarchy.
+
+    Args:
+        model_class: Model with the parent foreign key
+        rows: Dicts with the child and parent Factorial IDs (e.g. df.to_dict('records'))
+        child_column: Key of the child Factorial ID in each row
+        parent_column: Key of the parent Factorial ID in each row
+        parent_field: Name of the parent foreign key
+        key_field: Field holding the external ID
+        batch_size: Rows per UPDATE query
+
+    Returns:
+        dict: 'linked' count, 'missing' rows whose child or parent was not found, and 'instances'
+    """
+    links = {factorial_key(row[child_column]): factorial_key(row[parent_column]) for row in rows}
+    links = {child: parent for child, parent in links.items() if child is not None}
+    index = build_factorial_index(model_class, set(links) | set(links.values()), key_field=key_field)
+
+    children = model_class.objects.in_bulk([index[child] for child in links if child in index])
+    attname = model_class._meta.get_field(parent_field).attname
+    has_updated_at = any(field.name == 'updated_at' for field in model_class._meta.concrete_fields)
+    now = timezone.now()
+
+    to_update = []
+    missing = []
+    for child, parent in links.items():
+        child_pk = index.get(child)
+        parent_pk = index.get(parent) if parent is not None else None
+        if child_pk is None or (parent is not None and parent_pk is None):
+            missing.append({child_column: child, parent_column: parent})
+            continue
+        instance = children[child_pk]
+        setattr(instance, attname, parent_pk)
+        if has_updated_at:
+            instance.updated_at = now
+        to_update.append(instance)
+
+    fields = [parent_field] + (['updated_at'] if has_updated_at else [])
+    with transaction.atomic():
+        model_class.objects.bulk_update(to_update, fields, batch_size=batch_size)
+        # bulk_update bypasses save(), so refresh derived hierarchy data (Team.path)
+        if hasattr(model_class, 'rebuild_paths'):
+            model_class.rebuild_paths()
+
+    print(f"  🔗 Linked {len(to_update)} {model_class.__name__} rows to their parent"
+          + (f", ⚠️ {len(missing)} not found" if missing else ""))
+    return {'linked': len(to_update), 'missing': missing, 'instances': to_update}
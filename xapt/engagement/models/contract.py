@@ -2,6 +2,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from .base_model import BaseModel
 from .employee import Employee
+from .effective_period import EffectivePeriodQuerySet
 from .role import Role
 
 
@@ -49,10 +50,16 @@ class Contract(BaseModel):
         help_text="End date of the contract (null for ongoing contracts)"
     )
     
+    objects = EffectivePeriodQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Contract"
         verbose_name_plural = "Contracts"
         ordering = ['-effective_from']
+        indexes = [
+            models.Index(fields=['employee', 'effective_from', 'effective_to'], name='contract_emp_period_idx'),
+            models.Index(fields=['role', 'effective_from', 'effective_to'], name='contract_role_period_idx'),
+        ]
         
     def __str__(self):
         return f"{self.employee.full_name} - {self.role} ({self.effective_from})"
@@ -0,0 +1,75 @@
+from datetime import date
+
+from django.db import models
+
+
+def active_on_q(day=None, prefix=''):
+    """
+    Q object matching rows whose effective period covers a day.
+
+    Same rule as the is_active / is_active_relationship / is_active_contract properties:
+    started on or before the day, and either open-ended (effective_to is NULL) or ending
+    on or after it. Rows without an effective_from are never active.
+
+    Args:
+        day: Date to check (default: today)
+        prefix: Lookup path to the dated model, for filtering or annotating from a
+                related model (e.g. 'contracts__')
+
+    Returns:
+        Q: Filter usable in filter(), exclude() or Count(filter=...)
+    """
+    day = day or date.today()
+    return (
+        models.Q(**{f'{prefix}effective_from__lte': day})
+        & (models.Q(**{f'{prefix}effective_to__isnull': True}) | models.Q(**{f'{prefix}effective_to__gte': day}))
+    )
+
+
+def historical_on_q(day=None, prefix=''):
+    """
+    Q object matching rows that are not active on a day: ended before it, not started
+    yet, or without an effective_from. Exact complement of active_on_q.
+    """
+    day = day or date.today()
+    return (
+        models.Q(**{f'{prefix}effective_from__isnull': True})
+        | models.Q(**{f'{prefix}effective_from__gt': day})
+        | models.Q(**{f'{prefix}effective_to__lt': day})
+    )
+
+
+class EffectivePeriodQuerySet(models.QuerySet):
+    """
+    QuerySet for models with an effective_from / effective_to period
+    (TeamMembership, Manager, Contract).
+
+    The date logic runs in SQL, backed by the (fk, effective_from, effective_to)
+    indexes of each model, instead of loading every row and checking the
+    Python properties.
+
+    Example:
+        employee.contracts.active_on()
+        TeamMembership.objects.filter(team=team).active_on(date(2024, 1, 1)).count()
+    """
+
+    def active_on(self, day=None):
+        """Rows whose period covers day (default: today), open-ended periods included."""
+        return self.filter(active_on_q(day))
+
+    def historical(self, day=None):
+        """Rows not active on day (default: today): ended, not started yet or undated."""
+        return self.filter(historical_on_q(day))
+
+    def with_active_flag(self, day=None):
+        """
+        Annotate is_current (active on day, default today) computed in SQL, ordered active
+        first then most recent, so active and historical rows come from a single query.
+        """
+        return self.annotate(
+            is_current=models.Case(
+                models.When(active_on_q(day), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        ).order_by('-is_current', '-effective_from')
@@ -22,6 +22,43 @@ except ImportError as e:
     DBTRunner = None
 
 
+class EmployeeQuerySet(models.QuerySet):
+    """QuerySet for Employee with batch loading of the related profile data."""
+
+    def with_profile(self):
+        """
+        Prefetch everything get_all_info / get_all_info_markdown read: team memberships with
+        their team, manager relationships with the manager and contracts with their role.
+        Profiles for any number of employees then take a fixed 4 queries instead of
+        3 queries per employee plus one per related row.
+
+        Example:
+            for employee in Employee.objects.with_profile():
+                markdown = employee.get_all_info_markdown()
+        """
+        from .team import TeamMembership
+        from .manager import Manager
+        from .contract import Contract
+
+        return self.prefetch_related(
+            models.Prefetch(
+                'team_memberships',
+                queryset=TeamMembership.objects.select_related('team'),
+                to_attr='profile_memberships'
+            ),
+            models.Prefetch(
+                'manager_relationships',
+                queryset=Manager.objects.select_related('manager').order_by('-effective_from'),
+                to_attr='profile_manager_relationships'
+            ),
+            models.Prefetch(
+                'contracts',
+                queryset=Contract.objects.select_related('role').order_by('-effective_from'),
+                to_attr='profile_contracts'
+            ),
+        )
+
+
 class Employee(BaseModel):
     """
     Employee model that inherits from BaseModel.
@@ -43,6 +80,8 @@ class Employee(BaseModel):
         help_text="Date when the employee was offboarded"
     )
 
+    objects = EmployeeQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Employee"
         verbose_name_plural = "Employees"
@@ -102,6 +141,7 @@ class Employee(BaseModel):
         """
         Get all relevant information about the employee.
         Returns a comprehensive dictionary with employee details, teams, managers, contracts, and performance reviews.
+        Uses the data prefetched by Employee.objects.with_profile() when available.
         """
         from datetime import date
         
@@ -262,10 +302,16 @@ class Employee(BaseModel):
         """Get team membership information"""
         from .team import TeamMembership
         
-        today = date.today()
-        all_memberships = TeamMembership.objects.filter(employee=self)
-        active_memberships = [m for m in all_memberships if m.is_active]
-        historical_memberships = [m for m in all_memberships if not m.is_active]
+        all_memberships = getattr(self, 'profile_memberships', None)
+        if all_memberships is None:
+            all_memberships = list(
+                TeamMembership.objects.filter(employee=self).select_related('team').with_active_flag()
+            )
+            active_memberships = [m for m in all_memberships if m.is_current]
+            historical_memberships = [m for m in all_memberships if not m.is_current]
+        else:
+            active_memberships = [m for m in all_memberships if m.is_active]
+            historical_memberships = [m for m in all_memberships if not m.is_active]
         
         return {
             "summary": {
@@ -298,10 +344,16 @@ class Employee(BaseModel):
         """Get manager relationship information"""
         from .manager import Manager
         
-        today = date.today()
-        all_relationships = Manager.objects.filter(employee=self).order_by('-effective_from')
-        active_relationships = [r for r in all_relationships if r.is_active_relationship]
-        historical_relationships = [r for r in all_relationships if not r.is_active_relationship]
+        all_relationships = getattr(self, 'profile_manager_relationships', None)
+        if all_relationships is None:
+            all_relationships = list(
+                Manager.objects.filter(employee=self).select_related('manager').with_active_flag()
+            )
+            active_relationships = [r for r in all_relationships if r.is_current]
+            historical_relationships = [r for r in all_relationships if not r.is_current]
+        else:
+            active_relationships = [r for r in all_relationships if r.is_active_relationship]
+            historical_relationships = [r for r in all_relationships if not r.is_active_relationship]
         
         return {
             "summary": {
@@ -333,10 +385,16 @@ class Employee(BaseModel):
         """Get contract information"""
         from .contract import Contract
         
-        today = date.today()
-        all_contracts = Contract.objects.filter(employee=self).order_by('-effective_from')
-        active_contracts = [c for c in all_contracts if c.is_active_contract]
-        historical_contracts = [c for c in all_contracts if not c.is_active_contract]
+        all_contracts = getattr(self, 'profile_contracts', None)
+        if all_contracts is None:
+            all_contracts = list(
+                Contract.objects.filter(employee=self).select_related('role').with_active_flag()
+            )
+            active_contracts = [c for c in all_contracts if c.is_current]
+            historical_contracts = [c for c in all_contracts if not c.is_current]
+        else:
+            active_contracts = [c for c in all_contracts if c.is_active_contract]
+            historical_contracts = [c for c in all_contracts if not c.is_active_contract]
         
         # Calculate total compensation from active contracts
         total_compensation = sum(
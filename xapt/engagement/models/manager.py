@@ -2,6 +2,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from .base_model import BaseModel
 from .employee import Employee
+from .effective_period import EffectivePeriodQuerySet
 
 
 class Manager(BaseModel):
@@ -34,10 +35,16 @@ class Manager(BaseModel):
         help_text="End date of this manager relationship (null for ongoing relationships)"
     )
     
+    objects = EffectivePeriodQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Manager"
         verbose_name_plural = "Managers"
         ordering = ['-effective_from']
+        indexes = [
+            models.Index(fields=['employee', 'effective_from', 'effective_to'], name='manager_emp_period_idx'),
+            models.Index(fields=['manager', 'effective_from', 'effective_to'], name='manager_mgr_period_idx'),
+        ]
         
     def __str__(self):
         return f"{self.employee.full_name} managed by {self.manager.full_name} ({self.effective_from})"
@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class SyncWatermark(models.Model):
+    """
+    High-water mark of an incremental sync with an external source.
+    Stores the point in time up to which changes have already been applied locally,
+    so the next sync only asks the source for records modified after it.
+    """
+
+    name = models.CharField(max_length=100, unique=True, help_text="Identifier of the sync (e.g. 'tairtable_employees')")
+    watermark = models.DateTimeField(null=True, blank=True, help_text="Changes up to this time have been synced")
+    records_synced = models.PositiveIntegerField(default=0, help_text="Records applied by the last sync")
+
+    # Timestamps (not inheriting from BaseModel as this is bookkeeping, not an entity)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Sync Watermark"
+        verbose_name_plural = "Sync Watermarks"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
+
+    @classmethod
+    def get_watermark(cls, name):
+        """Return the stored watermark for name, or None if it never synced"""
+        return cls.objects.filter(name=name).values_list('watermark', flat=True).first()
+
+    @classmethod
+    def set_watermark(cls, name, watermark, records_synced=0):
+        """Store the watermark reached by a finished sync"""
+        cls.objects.update_or_create(
+            name=name,
+            defaults={'watermark': watermark, 'records_synced': records_synced},
+        )
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Concat, Substr
 from django.core.exceptions import ValidationError
 from .base_model import BaseModel
 from .employee import Employee
+from .effective_period import EffectivePeriodQuerySet
 
 
 class Team(BaseModel):
@@ -43,6 +45,20 @@ class Team(BaseModel):
         help_text="Parent team in the organizational hierarchy"
     )
     
+    # Materialized path of the hierarchy, maintained on save and by rebuild_paths()
+    path = models.CharField(
+        max_length=500,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text="Primary keys from the root down to this team, e.g. '/1/5/12/'"
+    )
+    depth = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of ancestors (0 for root teams)"
+    )
+    
     class Meta:
         verbose_name = "Team"
         verbose_name_plural = "Teams"
@@ -54,8 +70,90 @@ class Team(BaseModel):
         
     def save(self, *args, **kwargs):
         # Just use whatever level is provided - no auto-calculation
-        # Call BaseModel save (which calls super().save())
-        super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(Team, instance=self)
+        with transaction.atomic(using=using):
+            # Stored path before the save, which may write back a stale copy of it
+            stored = None
+            if not self._state.adding:
+                stored = Team.objects.using(using).filter(pk=self.pk).values_list('path', 'depth').first()
+            # Call BaseModel save (which calls super().save())
+            super().save(*args, **kwargs)
+            self._sync_path(using, stored)
+    
+    def _sync_path(self, using, stored=None):
+        """
+        Store this team's path and depth, recomputed from the parent's stored path, and, if
+        the team moved, re-root its whole subtree with a single UPDATE.
+        
+        Args:
+            using: Database alias
+            stored: (path, depth) of the row before this save, None for a new row
+        """
+        teams = Team.objects.using(using)
+        
+        parent_path = '/'
+        if self.parent_team_id:
+            parent_path = teams.filter(pk=self.parent_team_id).values_list('path', flat=True).first() or '/'
+        old_path, old_depth = stored or ('', 0)
+        new_path = f"{parent_path}{self.pk}/"
+        new_depth = new_path.count('/') - 2
+        
+        if old_path and parent_path.startswith(old_path):
+            raise ValidationError("Circular reference detected in team hierarchy")
+        
+        if old_path and (new_path != old_path or new_depth != old_depth):
+            teams.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(models.Value(new_path), Substr('path', len(old_path) + 1)),
+                depth=models.F('depth') + (new_depth - old_depth),
+            )
+        # The save itself may have written this instance's (stale or empty) copy
+        if (self.path, self.depth) != (new_path, new_depth) or (old_path, old_depth) != (new_path, new_depth):
+            teams.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        self.path, self.depth = new_path, new_depth
+    
+    @classmethod
+    def rebuild_paths(cls, using=None, batch_size=1000):
+        """
+        Recompute path and depth for every team from parent_team.
+        Needed after writes that bypass save(), such as bulk_create/bulk_update
+        (QueryLoader bulk mode and link_parents call it automatically).
+        
+        Args:
+            using: Database alias
+            batch_size: Rows per UPDATE query
+            
+        Returns:
+            int: Number of teams whose path changed
+        """
+        teams = cls.objects.using(using) if using else cls.objects
+        rows = {pk: (parent_id, path, depth) for pk, parent_id, path, depth
+                in teams.values_list('pk', 'parent_team_id', 'path', 'depth')}
+        
+        paths = {}
+        for pk in rows:
+            # Walk up until a team with a known path (or a root), then fill the chain back down
+            chain = []
+            current = pk
+            while current is not None and current not in paths:
+                if current in chain:
+                    raise ValidationError(f"Circular reference detected in team hierarchy (team {current})")
+                chain.append(current)
+                parent_id = rows[current][0]
+                current = parent_id if parent_id in rows else None
+            path = paths[current] if current is not None else '/'
+            for node in reversed(chain):
+                path = f"{path}{node}/"
+                paths[node] = path
+        
+        changed = []
+        for pk, path in paths.items():
+            depth = path.count('/') - 2
+            if (path, depth) != rows[pk][1:]:
+                changed.append(cls(pk=pk, path=path, depth=depth))
+        if changed:
+            teams.bulk_update(changed, ['path', 'depth'], batch_size=batch_size)
+            print(f"  🌳 Rebuilt hierarchy paths of {len(changed)} teams")
+        return len(changed)
     
     def clean(self):
         """Validate the team data"""
@@ -66,19 +164,19 @@ class Team(BaseModel):
             if self.parent_team == self:
                 raise ValidationError("A team cannot be its own parent")
             
-            # Check for circular reference in hierarchy
-            current_parent = self.parent_team
-            while current_parent:
-                if current_parent == self:
-                    raise ValidationError("Circular reference detected in team hierarchy")
-                current_parent = current_parent.parent_team
+            # The new parent must not be in this team's subtree
+            if self.pk and self.path and self.parent_team.path.startswith(self.path):
+                raise ValidationError("Circular reference detected in team hierarchy")
+    
+    def _ancestor_ids(self):
+        """Primary keys of the ancestors from the root down, read from path"""
+        return [int(pk) for pk in self.path.strip('/').split('/')[:-1]] if self.path else []
     
     @property
     def full_hierarchy_name(self):
         """Return full hierarchical name (e.g., 'Engineering > Backend Team')"""
-        if self.parent_team:
-            return f"{self.parent_team.full_hierarchy_name} > {self.team_name}"
-        return self.team_name
+        names = [team.team_name for team in reversed(self.get_all_ancestors())]
+        return ' > '.join(names + [self.team_name])
     
     @property
     def is_root_team(self):
@@ -91,51 +189,43 @@ class Team(BaseModel):
         return not self.child_teams.exists()
     
     def get_all_descendants(self):
-        """Get all descendant teams recursively"""
-        descendants = list(self.child_teams.all())
-        for child in self.child_teams.all():
-            descendants.extend(child.get_all_descendants())
-        return descendants
+        """Get all descendant teams (one query on the path prefix)"""
+        if not self.path:
+            # Path not built yet (e.g. before rebuild_paths)
+            return list(Team.objects.filter(pk__in=self._walk_subtree_ids()[1:]))
+        return list(Team.objects.filter(path__startswith=self.path).exclude(pk=self.pk))
+    
+    def _walk_subtree_ids(self):
+        """This team's pk followed by its descendants', walking parent_team one level per query"""
+        subtree = [self.pk]
+        seen = {self.pk}
+        level = [self.pk]
+        while level:
+            level = [pk for pk in Team.objects.filter(parent_team_id__in=level).values_list('pk', flat=True)
+                     if pk not in seen]
+            seen.update(level)
+            subtree.extend(level)
+        return subtree
     
     def get_all_ancestors(self):
-        """Get all ancestor teams up to root"""
-        ancestors = []
-        current_parent = self.parent_team
-        while current_parent:
-            ancestors.append(current_parent)
-            current_parent = current_parent.parent_team
-        return ancestors
+        """Get all ancestor teams up to root, nearest first (one query)"""
+        return list(Team.objects.filter(pk__in=self._ancestor_ids()).order_by('-depth'))
     
     def get_team_size(self, include_descendants=False):
         """Get number of team members (current active memberships)"""
-        from datetime import date
-        today = date.today()
-        
         if include_descendants:
-            # Include all descendant teams
-            teams_to_count = [self] + self.get_all_descendants()
-            return TeamMembership.objects.filter(
-                team__in=teams_to_count,
-                effective_from__lte=today,
-                effective_to__gte=today
-            ).count()
+            # This team and its whole subtree
+            if not self.path:
+                # Path not built yet (e.g. before rebuild_paths)
+                return TeamMembership.objects.filter(team_id__in=self._walk_subtree_ids()).active_on().count()
+            return TeamMembership.objects.filter(team__path__startswith=self.path).active_on().count()
         else:
             # Only this team
-            return self.memberships.filter(
-                effective_from__lte=today,
-                effective_to__gte=today
-            ).count()
+            return self.memberships.active_on().count()
     
     def get_current_members(self):
         """Get current active team members"""
-        from datetime import date
-        today = date.today()
-        
-        return TeamMembership.objects.filter(
-            team=self,
-            effective_from__lte=today,
-            effective_to__gte=today
-        ).select_related('employee')
+        return TeamMembership.objects.filter(team=self).active_on().select_related('employee')
     
     def get_current_leaders(self):
         """Get current team leaders"""
@@ -186,11 +276,17 @@ class TeamMembership(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EffectivePeriodQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Team Membership"
         verbose_name_plural = "Team Memberships"
         ordering = ['-effective_from', 'team__team_name', 'employee__last_name']
         unique_together = ['employee', 'team', 'effective_from']  # No duplicate memberships on same date
+        indexes = [
+            models.Index(fields=['employee', 'effective_from', 'effective_to'], name='membership_emp_period_idx'),
+            models.Index(fields=['team', 'effective_from', 'effective_to'], name='membership_team_period_idx'),
+        ]
         
     def __str__(self):
         lead_indicator = " (Lead)" if self.is_lead else ""
@@ -243,25 +339,12 @@ class TeamMembership(models.Model):
     @classmethod
     def get_active_memberships(cls, date_filter=None):
         """Get all active memberships for a given date (default: today)"""
-        from datetime import date
-        filter_date = date_filter or date.today()
-        
-        return cls.objects.filter(
-            effective_from__lte=filter_date,
-            effective_to__gte=filter_date
-        )
+        return cls.objects.active_on(date_filter)
     
     @classmethod
     def get_employee_current_teams(cls, employee):
         """Get all current teams for an employee"""
-        from datetime import date
-        today = date.today()
-        
-        return cls.objects.filter(
-            employee=employee,
-            effective_from__lte=today,
-            effective_to__gte=today
-        ).select_related('team')
+        return cls.objects.filter(employee=employee).active_on().select_related('team')
     
     @classmethod
     def get_team_history(cls, team):
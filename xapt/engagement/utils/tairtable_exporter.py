@@ -1,5 +1,9 @@
 import os
 import sys
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
 
 # Add PAE project root to Python path to access utils modules
 PAE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -19,7 +23,12 @@ except ImportError as e:
     Loader = None
     DBTRunner = None
 
-from ..models import Employee, PerformanceReview
+from ..models import Employee, PerformanceReview, SyncWatermark
+
+# Employee fields kept in sync from Tairtable
+EMPLOYEE_SYNC_FIELDS = ['first_name', 'last_name', 'email']
+# Re-read changes this far before the watermark to absorb clock skew with Airtable
+SYNC_OVERLAP = timedelta(minutes=5)
 
 class TairtableExporter:
     def __init__(self):
@@ -30,16 +39,22 @@ class TairtableExporter:
 
     def delete_everything(self):
         """
-        Delete all employee records from the Tairtable employee table.
+        Delete all employee and performance review records from Tairtable.
+        Returns:
+            dict: delete_all_records summary per table URL
+        Raises:
+            Exception: If some records could not be deleted; rerun to resume
         """
-        self.tair_client.delete_all_records(self.employee_table_url)
-        self.tair_client.delete_all_records(self.performance_review_table_url)
+        return {
+            table_url: self.tair_client.delete_all_records(table_url)
+            for table_url in (self.employee_table_url, self.performance_review_table_url)
+        }
 
     def delete_performance_reviews(self):
         """
         Delete all performance review records from the Tairtable performance review table.
         """
-        self.tair_client.delete_all_records(self.performance_review_table_url)
+        return self.tair_client.delete_all_records(self.performance_review_table_url)
 
     def _update_employee_from_tairtable(self, employee):
         employee_record_id = employee.tair_id
@@ -56,6 +71,62 @@ class TairtableExporter:
             employee.email = data.get('email', employee.email)
             employee.save()
 
+    def sync_employees_from_tairtable(self, full=False, batch_size=500):
+        """
+        Pull employee changes from Tairtable and apply them in bulk.
+
+        Only records whose LAST_MODIFIED_TIME() is after the stored watermark are requested
+        (all of them on the first run or with full=True), so the cost follows the number of
+        changes rather than the table size. Matching employees are updated by tair_id with
+        bulk_update, and the watermark moves to the time the sync started.
+
+        Args:
+            full (bool): Ignore the watermark and pull every record
+            batch_size (int): Employees updated per bulk_update query
+        Returns:
+            dict: 'fetched' records, 'updated' employees, 'unmatched' tair_ids and the new 'watermark'
+        """
+        watermark_name = 'tairtable_employees'
+        sync_started = timezone.now()
+        watermark = None if full else SyncWatermark.get_watermark(watermark_name)
+
+        formula = None
+        if watermark:
+            since = (watermark - SYNC_OVERLAP).astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since}'))"
+            print(f"🔄 Pulling Tairtable employee changes since {since}")
+        else:
+            print("🔄 Pulling all Tairtable employees")
+
+        parsed = self.tair_client.parse_airtable_url(self.employee_table_url)
+        changes = {
+            record['id']: record.get('fields', {})
+            for record in self.tair_client.iter_records(
+                parsed['base_id'], parsed['table_id'],
+                fields=EMPLOYEE_SYNC_FIELDS, filter_by_formula=formula,
+            )
+        }
+
+        updated = 0
+        with transaction.atomic():
+            employees = Employee.objects.filter(tair_id__in=list(changes)).only('id', 'tair_id', *EMPLOYEE_SYNC_FIELDS)
+            to_update = []
+            for employee in employees.iterator(chunk_size=batch_size):
+                data = changes[employee.tair_id]
+                for field in EMPLOYEE_SYNC_FIELDS:
+                    setattr(employee, field, data.get(field, getattr(employee, field)))
+                # bulk_update does not run auto_now
+                employee.updated_at = sync_started
+                to_update.append(employee)
+            Employee.objects.bulk_update(to_update, EMPLOYEE_SYNC_FIELDS + ['updated_at'], batch_size=batch_size)
+            updated = len(to_update)
+            SyncWatermark.set_watermark(watermark_name, sync_started, records_synced=updated)
+
+        unmatched = sorted(set(changes) - {employee.tair_id for employee in to_update})
+        print(f"✅ Synced {updated} employees from {len(changes)} changed Tairtable records"
+              + (f" ({len(unmatched)} without a local employee)" if unmatched else ""))
+        return {'fetched': len(changes), 'updated': updated, 'unmatched': unmatched, 'watermark': sync_started}
+
     def _export_performance_review(self, review: PerformanceReview):
         """
         Export a single performance review to Tairtable.
@@ -124,6 +195,67 @@ class TairtableExporter:
             employee.save()
             print(f"✅ Exported {employee.full_name} with tair_id: {employee.tair_id}")
 
+    def _employee_fields(self, employee: Employee):
+        return {
+            "first_name": employee.first_name,
+            "last_name": employee.last_name,
+            "email": employee.email,
+            "full_name": employee.full_name,
+            "employee_info": employee.get_all_info_markdown(),
+            "onboarding_date": employee.onboarding_date.isoformat() if employee.onboarding_date else None,
+            "offboarding_date": employee.offboarding_date.isoformat() if employee.offboarding_date else None
+        }
+
+    def export_employees(self, employees=None, batch_size=500):
+        """
+        Export many employees to Tairtable at once.
+
+        Profiles are built from Employee.objects.with_profile(), so rendering the markdown
+        takes a fixed number of queries per batch. Employees without a tair_id are created
+        and the others updated with the batched Airtable APIs; the new tair_ids are saved
+        with one bulk_update.
+
+        Args:
+            employees: Employee queryset to export (all employees by default)
+            batch_size (int): Employees loaded and rendered per batch
+        Returns:
+            dict: 'created', 'updated' and 'failed' counts
+        """
+        queryset = (employees if employees is not None else Employee.objects.all()).with_profile().order_by('pk')
+        summary = {'created': 0, 'updated': 0, 'failed': 0}
+
+        pks = list(queryset.values_list('pk', flat=True))
+        for i in range(0, len(pks), batch_size):
+            batch = list(queryset.filter(pk__in=pks[i:i + batch_size]))
+            new_employees = [employee for employee in batch if not employee.tair_id]
+            existing_employees = [employee for employee in batch if employee.tair_id]
+
+            if new_employees:
+                result = self.tair_client.create_records(
+                    self.employee_table_url, [self._employee_fields(employee) for employee in new_employees]
+                )
+                created = []
+                for entry in result['results']:
+                    if entry['record']:
+                        employee = new_employees[entry['index']]
+                        employee.tair_id = entry['record']['id']
+                        created.append(employee)
+                Employee.objects.bulk_update(created, ['tair_id'])
+                summary['created'] += len(created)
+                summary['failed'] += result['failed']
+
+            if existing_employees:
+                result = self.tair_client.update_records(
+                    self.employee_table_url,
+                    [{'id': employee.tair_id, 'fields': self._employee_fields(employee)} for employee in existing_employees]
+                )
+                summary['updated'] += result['succeeded']
+                summary['failed'] += result['failed']
+
+        print(f"✅ Exported employees to Tairtable: {summary['created']} created, "
+              f"{summary['updated']} updated, {summary['failed']} failed")
+        return summary
+
     def _update_employee(self, employee: Employee):
         """
         Update an existing employee record in Tairtable.